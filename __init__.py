@@ -24,8 +24,18 @@ except Exception:
     VERSION = "0.0.0"
 
 
-def show(mod_name=MOD_NAME, force_reload=True):
+def show(mod_name=MOD_NAME, force_reload=False):
+    """
+    Opens JobUI. Reopening it reuses the modules already imported, with the loaded jobs
+    and the scraper's connections; pass `force_reload=True` to re-import JobUI after
+    editing it.
+    """
     if force_reload:
+        # The shared ConfigManager runs code of the modules about to be replaced
+        config_manager = sys.modules.get(mod_name + ".core.config_manager")
+        if config_manager is not None:
+            config_manager.release_shared_config_manager()
+
         # Recursive reload for submodules in this package
         for name in list(sys.modules.keys()):
             if name == mod_name or name.startswith(mod_name + "."):
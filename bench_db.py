@@ -0,0 +1,269 @@
+import os
+import re
+import sys
+import sqlite3
+import tempfile
+import time
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from core.job_index import EVENT_APPEARED, EVENT_DISAPPEARED
+from core.job_store import JobStore, fts_query
+
+STUDIOS = 74
+JOBS_PER_STUDIO = 40
+ROUNDS = 5
+
+# Jobs per studio in the large history used for the startup load
+HISTORY_PER_STUDIO = 1000
+STARTUP_LIMIT = 20
+
+ROLES = ("Animator", "Rigger", "Compositor", "Lighting TD", "Modeler", "Producer", "Pipeline Developer", "FX Artist")
+
+
+class PerCallStore(JobStore):
+    """The previous behaviour: a fresh connection with default pragmas for every call."""
+
+    def connect(self):
+        conn = sqlite3.connect(self.db_path)
+        conn.row_factory = sqlite3.Row
+        return conn
+
+
+def make_jobs(studio_index, round_index):
+    # A few jobs change every round, the rest are seen again
+    jobs = []
+    for j in range(JOBS_PER_STUDIO):
+        suffix = f"-r{round_index}" if j < 3 else ""
+        jobs.append(
+            {
+                "title": f"Job {j}{suffix}",
+                "link": f"https://studio{studio_index}.example/jobs/{j}{suffix}",
+                "location": "London, UK",
+                "extra_link": "",
+            }
+        )
+    return jobs
+
+
+def bench(store_cls, batched=False):
+    with tempfile.TemporaryDirectory() as tmp:
+        store = store_cls(os.path.join(tmp, "jobs.db"))
+        syncs = 0
+        start = time.perf_counter()
+        for r in range(ROUNDS):
+            results = [(f"studio{s}", make_jobs(s, r)) for s in range(STUDIOS)]
+            if batched:
+                # What DbWriter does: one transaction for every studio in the window
+                store.sync_many(results)
+            else:
+                for studio_id, jobs in results:
+                    store.sync_studio_jobs(studio_id, jobs)
+            syncs += len(results)
+        elapsed = time.perf_counter() - start
+        store.close()
+    return syncs, elapsed
+
+
+def bench_index():
+    """Returns (in-memory sync seconds per studio, total seconds including the write-behind)."""
+    with tempfile.TemporaryDirectory() as tmp:
+        store = JobStore(os.path.join(tmp, "jobs.db"))
+        index = store.load_index()
+        in_memory = 0.0
+        start = time.perf_counter()
+        for r in range(ROUNDS):
+            changes = []
+            for s in range(STUDIOS):
+                jobs = make_jobs(s, r)
+                t = time.perf_counter()
+                changes.append(index.sync(f"studio{s}", jobs)[1])
+                in_memory += time.perf_counter() - t
+            store.apply_changes(changes)
+        elapsed = time.perf_counter() - start
+        store.close()
+    return in_memory / (ROUNDS * STUDIOS), elapsed
+
+
+def bench_idle_writes():
+    """Rows written by a refresh in which no studio changed."""
+    with tempfile.TemporaryDirectory() as tmp:
+        store = JobStore(os.path.join(tmp, "jobs.db"))
+        results = [(f"studio{s}", make_jobs(s, 0)) for s in range(STUDIOS)]
+        store.sync_many(results)
+        conn = store.connect()
+        before = conn.total_changes
+        store.sync_many(results)
+        written = conn.total_changes - before
+        store.close()
+    return written
+
+
+def fill_history(store, per_studio=HISTORY_PER_STUDIO):
+    now = time.time()
+    rows = [
+        (s * per_studio + j, f"studio{s}", f"{ROLES[(s + j) % len(ROLES)]} {j}", f"https://studio{s}.example/jobs/{j}", "London, UK", "", now - j, now)
+        for s in range(STUDIOS)
+        for j in range(per_studio)
+    ]
+    with store.connect() as conn:
+        conn.executemany(
+            "INSERT INTO jobs (job_hash, studio_id, title, link, location, extra_link, first_seen, last_seen) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            rows,
+        )
+        conn.commit()
+    return [row[2] for row in rows]
+
+
+def bench_startup():
+    """Returns (full load seconds, newest-jobs load seconds) of a large history."""
+    with tempfile.TemporaryDirectory() as tmp:
+        store = JobStore(os.path.join(tmp, "jobs.db"))
+        fill_history(store)
+
+        start = time.perf_counter()
+        store.load_index()
+        full = time.perf_counter() - start
+
+        start = time.perf_counter()
+        store.load_recent_index({f"studio{s}" for s in range(STUDIOS)}, STARTUP_LIMIT)
+        recent = time.perf_counter() - start
+        store.close()
+    return full, recent
+
+
+def bench_search(per_studio):
+    """
+    Returns (selective full-text seconds, broad full-text seconds, regex seconds) per
+    search over a history of `per_studio` jobs per studio.
+    """
+    with tempfile.TemporaryDirectory() as tmp:
+        store = JobStore(os.path.join(tmp, "jobs.db"))
+        titles = fill_history(store, per_studio)
+        # A handful of jobs match each of these; every eighth job is a rigger
+        selective = ["pipeline dev 12", "fx artist 35", "lighting td 4"]
+        broad = "rigger"
+
+        start = time.perf_counter()
+        for text in selective:
+            store.search_jobs(fts_query(text))
+        fts = (time.perf_counter() - start) / len(selective)
+
+        start = time.perf_counter()
+        store.search_jobs(fts_query(broad))
+        fts_broad = time.perf_counter() - start
+
+        start = time.perf_counter()
+        for text in selective + [broad]:
+            regex = re.compile(text, re.IGNORECASE)
+            [t for t in titles if regex.search(t)]
+        regex = (time.perf_counter() - start) / (len(selective) + 1)
+        store.close()
+    return fts, fts_broad, regex
+
+
+def bench_events():
+    """Returns (event count, new-jobs query seconds, weekly counts seconds) over a year of events."""
+    with tempfile.TemporaryDirectory() as tmp:
+        store = JobStore(os.path.join(tmp, "jobs.db"))
+        fill_history(store)
+        now = int(time.time())
+        year = 365 * 86400
+        # Every job of the history appeared and disappeared once over the last year
+        events = []
+        for s in range(STUDIOS):
+            for j in range(HISTORY_PER_STUDIO):
+                appeared = now - year + (j * year) // HISTORY_PER_STUDIO
+                events.append((appeared, s + 1, EVENT_APPEARED, s * HISTORY_PER_STUDIO + j))
+                events.append((appeared + 14 * 86400, s + 1, EVENT_DISAPPEARED, s * HISTORY_PER_STUDIO + j))
+        events.sort()
+        with store.connect() as conn:
+            conn.executemany("INSERT INTO studios (studio_key, studio_id) VALUES (?, ?)", [(s + 1, f"studio{s}") for s in range(STUDIOS)])
+            conn.executemany("INSERT INTO job_events VALUES (?, ?, ?, ?)", events)
+            conn.commit()
+
+        start = time.perf_counter()
+        store.new_jobs_since(now - 86400)
+        new_jobs = time.perf_counter() - start
+
+        start = time.perf_counter()
+        store.weekly_event_counts(now - year)
+        weekly = time.perf_counter() - start
+        store.close()
+    return len(events), new_jobs, weekly
+
+
+def bench_archive():
+    """Returns (jobs archived, seconds, bytes per job in jobs.db, bytes per job in the archive)."""
+    with tempfile.TemporaryDirectory() as tmp:
+        store = JobStore(os.path.join(tmp, "jobs.db"))
+        fill_history(store)
+        with store.connect() as conn:
+            conn.execute("UPDATE jobs SET last_seen = last_seen - 30 * 86400")
+            conn.commit()
+            conn.execute("VACUUM")
+        count = STUDIOS * HISTORY_PER_STUDIO
+        hot_size = os.path.getsize(store.db_path)
+
+        start = time.perf_counter()
+        store.maintain()
+        elapsed = time.perf_counter() - start
+
+        with store.attach_archive() as conn:
+            conn.execute("PRAGMA archive.wal_checkpoint(TRUNCATE)")
+            conn.execute("VACUUM archive")
+        archive_size = os.path.getsize(store.archive_path)
+        store.close()
+    return count, elapsed, hot_size / count, archive_size / count
+
+
+if __name__ == "__main__":
+    print(f"{STUDIOS} studios x {JOBS_PER_STUDIO} jobs, {ROUNDS} refresh rounds\n")
+    results = {}
+    runs = (
+        ("per-call connections", PerCallStore, False),
+        ("per-thread connections", JobStore, False),
+        ("batched transaction", JobStore, True),
+    )
+    for label, store_cls, batched in runs:
+        syncs, elapsed = bench(store_cls, batched)
+        results[label] = elapsed
+        print(f"{label:<24} {elapsed:7.3f}s  {syncs / elapsed:8.1f} studio syncs/s")
+
+    before = results["per-call connections"]
+    print()
+    for label, elapsed in list(results.items())[1:]:
+        print(f"Speedup ({label}): {before / elapsed:.2f}x")
+
+    per_studio, elapsed = bench_index()
+    print(f"\nIn-memory index: {per_studio * 1000:.3f} ms per studio sync, {elapsed:.3f}s including write-behind")
+
+    print(f"\nRows written by a no-change refresh: {bench_idle_writes()} (of {STUDIOS * JOBS_PER_STUDIO})")
+
+    full, recent = bench_startup()
+    print(
+        f"\nStartup load of {STUDIOS * HISTORY_PER_STUDIO} jobs: {full:.3f}s full, "
+        f"{recent:.3f}s newest {STARTUP_LIMIT} per studio ({full / recent:.1f}x)"
+    )
+
+    print()
+    for per_studio in (100, 1000):
+        fts, fts_broad, regex = bench_search(per_studio)
+        print(
+            f"Search over {STUDIOS * per_studio} jobs: {fts * 1000:.2f} ms full-text, "
+            f"{fts_broad * 1000:.2f} ms full-text matching every eighth job, "
+            f"{regex * 1000:.2f} ms regex over every title"
+        )
+
+    count, elapsed, hot, archived = bench_archive()
+    print(
+        f"\nArchiving {count} expired jobs: {elapsed:.3f}s, "
+        f"{hot:.0f} bytes per job in jobs.db, {archived:.0f} in the archive"
+    )
+
+    count, new_jobs, weekly = bench_events()
+    print(
+        f"\nJob events ({count} over a year): {new_jobs * 1000:.2f} ms new jobs of the last day, "
+        f"{weekly * 1000:.2f} ms postings per studio per week"
+    )
@@ -0,0 +1,69 @@
+"""
+Import-time report of the JobUI startup path. Every module is imported in a fresh
+interpreter with `python -X importtime`, and the slowest imports are listed. Exits
+with 1 if the scraping dependencies are imported before the first scrape.
+
+Run it with mayapy to include the Maya UI modules:
+
+    mayapy bench_import.py
+"""
+
+import os
+import re
+import subprocess
+import sys
+
+ROOT_DIR = os.path.dirname(os.path.abspath(__file__))
+PACKAGE = os.path.basename(ROOT_DIR)
+
+# Imported when JobUI.show() opens the window
+STARTUP_MODULES = ("core.config_manager", "ui.main_window")
+
+# Only the first scrape may import these
+HEAVY_MODULES = ("requests", "bs4", "urllib3")
+
+TOP = 12
+
+IMPORT_TIME_RE = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \| (\s*)(\S+)")
+
+
+def import_times(module):
+    """
+    Returns ({module: (self µs, cumulative µs)}, error) of importing `module` in a
+    fresh interpreter. `error` is the last line of the traceback if the import failed.
+    """
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=os.path.dirname(ROOT_DIR),
+        capture_output=True,
+        text=True,
+    )
+    times = {}
+    for line in proc.stderr.splitlines():
+        m = IMPORT_TIME_RE.match(line)
+        if m:
+            times[m.group(4)] = (int(m.group(1)), int(m.group(2)))
+    error = proc.stderr.strip().splitlines()[-1] if proc.returncode else None
+    return times, error
+
+
+if __name__ == "__main__":
+    failed = False
+    for name in STARTUP_MODULES:
+        module = f"{PACKAGE}.{name}"
+        times, error = import_times(module)
+        if error:
+            print(f"{module}: skipped ({error})\n")
+            continue
+
+        print(f"{module}: {times[module][1] / 1000:.1f} ms, {len(times)} modules")
+        for mod, (own, _) in sorted(times.items(), key=lambda item: -item[1][0])[:TOP]:
+            print(f"  {own / 1000:7.1f} ms  {mod}")
+
+        heavy = [mod for mod in HEAVY_MODULES if mod in times]
+        if heavy:
+            failed = True
+            print(f"  imported before the first scrape: {', '.join(heavy)}")
+        print()
+
+    sys.exit(1 if failed else 0)
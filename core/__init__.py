@@ -1,4 +1,14 @@
-from .config_manager import ConfigManager
-from .job_scraper import JobScraper
-
 __all__ = ["ConfigManager", "JobScraper"]
+
+
+def __getattr__(name):
+    # Imported lazily so that headless entry points (e.g. the scrape service) do not pull in Qt
+    if name == "ConfigManager":
+        from .config_manager import ConfigManager
+
+        return ConfigManager
+    if name == "JobScraper":
+        from .job_scraper import JobScraper
+
+        return JobScraper
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
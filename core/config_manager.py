@@ -1,29 +1,66 @@
 import json
 import os
-import sqlite3
-import hashlib
+import time
 from .logger import logger
-from datetime import datetime
 
-from .logo_worker import LogoWorker
+from .logo_worker import LogoLoader, LogoWorker
+from .job_store import JobStore, fts_query
+from .job_index import diff_jobs
+from .. import VERSION
+from .studio_config import (
+    config_hash,
+    config_signature,
+    diff_studios,
+    resolve_config_path,
+    read_studios,
+    read_studios_cached,
+    write_studios_cache,
+    write_studios,
+)
+from .scrape_queue import ScrapeQueue, dispatch
+from .scrape_lease import ScrapeLease
+from .db_writer import DbWriter
+from .scrape_service import get_python_executable
 
 try:
-    from PySide2 import QtCore
+    from PySide2 import QtCore, QtGui
 except ImportError:
-    from PySide6 import QtCore
+    from PySide6 import QtCore, QtGui
+
+# Newest jobs loaded per enabled studio at startup, a card shows about five. The rest
+# of a studio's history is read when its card is scrolled, a search runs or it syncs.
+STARTUP_JOBS_PER_STUDIO = 20
+
+# Editors often save in several steps (truncate, write, rename), so file watcher
+# events are gathered for this long before the studio config is checked
+CONFIG_WATCH_DELAY = 200  # ms
+
+# Studio edits made within this window are saved together
+CONFIG_SAVE_DELAY = 500  # ms
+
+# Opening the window only refreshes studios last scraped longer ago than this. Times
+# read from jobs.db are up to LAST_SEEN_GRANULARITY old, so those err towards a scrape.
+FRESH_JOBS_AGE = 30 * 60  # seconds
+
+# Logos are decoded at the size studio cards show them
+LOGO_SIZE = (110, 30)
 
 
 class ConfigManager(QtCore.QObject):
     logos_updated = QtCore.Signal()  # Emitted when any logo is downloaded (general update)
     logo_downloaded = QtCore.Signal(str)  # Emitted when a specific logo is ready
     logo_cleared = QtCore.Signal(str)  # Emitted when a logo is removed (to show text placeholder)
+    logo_loaded = QtCore.Signal(str)  # Emitted when a logo asked for by `logo_pixmap` is decoded
 
     jobs_updated = QtCore.Signal(str, list)  # studio_id, date
+    jobs_delta = QtCore.Signal(str, dict)  # studio_id, {"added": [jobs], "removed": [job_hash], "changed": [jobs]}
     jobs_failed = QtCore.Signal(str, str)  # studio_id, error_message
     jobs_started = QtCore.Signal(str)  # studio_id
+    search_finished = QtCore.Signal(str, object)  # search text, {studio_id: {job_hash: rank}}
     studio_visibility_changed = QtCore.Signal(str, bool)  # studio_id, enabled
     studios_visibility_changed = QtCore.Signal()  # For bulk changes
     studios_refreshed = QtCore.Signal()  # Emitted when studios are added/edited/removed
+    studios_delta = QtCore.Signal(dict)  # {"added": [studios], "removed": [studio_id], "updated": [studios]}
 
     def __init__(self, parent=None):
         super(ConfigManager, self).__init__(parent)
@@ -43,159 +80,203 @@ class ConfigManager(QtCore.QObject):
 
         self.studios = []
         self.jobs_cache = {}  # {studio_id: [jobs]}
+        self._loading_studios = set()  # Partly loaded studios whose full history was requested
+        self._pending_results = {}  # {studio_id: jobs} scraped before the history was loaded
+        self._generations = {}  # {studio_id: count of changes made to the index}, see _on_jobs_changed
+        self._visible_studios = frozenset()  # Studio cards currently on screen
 
         self.logo_worker = None
         self.job_worker = None
 
-        from .job_scraper import JobScraper
+        # Decoded logos, kept for every window: {studio_id: ((mtime, size), QPixmap or None)}
+        self._logos = {}
+        self._logo_requests = {}  # {studio_id: (mtime, size)} being decoded
+        self.logo_loader = LogoLoader(*LOGO_SIZE)
+        self.logo_loader.logo_loaded.connect(self._on_logo_loaded)
+        self.logo_loader.start()
+
+        # Run scrapes in a separate process to keep the host UI responsive
+        val = self.settings.value("scrape_in_subprocess", False)
+        self.use_scrape_process = val if isinstance(val, bool) else (str(val).lower() == "true")
 
-        self.scraper = JobScraper()
+        self._scraper = None  # requests and bs4 are only imported by the first scrape
 
         # Job History (SQLite)
         self.db_path = os.path.join(self.root_dir, "config", "jobs.db")
-        self._init_db()
+        self.store = JobStore(self.db_path)
 
         self._config_hash = None
-        self.load_config()
+        self._config_signature = None  # (mtime, size, inode) of the config when it was hashed
+        self._unsaved_studios = set()  # ids edited since the last save, None for all
+        self._removed_studios = set()
+        self._save_timer = QtCore.QTimer(self)
+        self._save_timer.setSingleShot(True)
+        self._save_timer.setInterval(CONFIG_SAVE_DELAY)
+        self._save_timer.timeout.connect(self.flush_config)
+        self.load_config()  # Also downloads the logos that are missing
+
+        # Reload the studio config when it is edited outside of JobUI. The directory is watched
+        # too because saving by rename replaces the file and drops it from the watcher.
+        self._config_timer = QtCore.QTimer(self)
+        self._config_timer.setSingleShot(True)
+        self._config_timer.setInterval(CONFIG_WATCH_DELAY)
+        self._config_timer.timeout.connect(self._on_config_file_changed)
+        self._config_watcher = QtCore.QFileSystemWatcher(self)
+        self._watch_config()
+        self._config_watcher.fileChanged.connect(self._config_timer.start)
+        self._config_watcher.directoryChanged.connect(self._config_timer.start)
         self._load_jobs_from_db()
-        self.download_missing_logos()
 
-    def _get_db_connection(self):
-        """Creates a new database connection."""
-        conn = sqlite3.connect(self.db_path)
-        conn.row_factory = sqlite3.Row
-        return conn
+        self._last_scrape_times = self.index.last_scrape_times()
 
-    def _init_db(self):
-        """Initializes the database schema."""
-        try:
-            with self._get_db_connection() as conn:
-                # Enable WAL mode for better concurrency
-                conn.execute("PRAGMA journal_mode=WAL;")
-
-                conn.execute("""
-                    CREATE TABLE IF NOT EXISTS jobs (
-                        job_hash TEXT PRIMARY KEY,
-                        studio_id TEXT,
-                        title TEXT,
-                        link TEXT,
-                        location TEXT,
-                        extra_link TEXT,
-                        first_seen REAL,
-                        last_seen REAL
-                    )
-                """)
-
-                # Migration: Add new columns if they don't exist
-                cursor = conn.cursor()
-                cursor.execute("PRAGMA table_info(jobs)")
-                columns = [row["name"] for row in cursor.fetchall()]
-
-                needed_columns = {"title": "TEXT", "link": "TEXT", "location": "TEXT", "extra_link": "TEXT"}
-
-                for col, col_type in needed_columns.items():
-                    if col not in columns:
-                        logger.info(f"Migrating DB: Adding {col} column to 'jobs' table.")
-                        conn.execute(f"ALTER TABLE jobs ADD COLUMN {col} {col_type}")
-
-                conn.execute("CREATE INDEX IF NOT EXISTS idx_studio_id ON jobs (studio_id)")
-                conn.commit()
-        except sqlite3.Error as e:
-            logger.error(f"Database initialization failed: {e}")
+        # Only one session sharing jobs.db runs scheduled scrapes, the others follow
+        self.lease = ScrapeLease(self.store)
+        self.lease.renew()
 
-    def _load_jobs_from_db(self):
-        """Populates the jobs cache from the database on startup."""
-        try:
-            with self._get_db_connection() as conn:
-                # Cleanup jobs older than 7 days on startup
-                day_7_threshold = datetime.now().timestamp() - (7 * 86400)
-                conn.execute("DELETE FROM jobs WHERE last_seen < ?", (day_7_threshold,))
-                conn.commit()
-
-                cursor = conn.cursor()
-                cursor.execute("""
-                    SELECT studio_id, title, link, location, extra_link, first_seen 
-                    FROM jobs 
-                    ORDER BY first_seen DESC
-                """)
-                rows = cursor.fetchall()
-
-                for row in rows:
-                    sid = row["studio_id"]
-                    if sid not in self.jobs_cache:
-                        self.jobs_cache[sid] = []
-
-                    self.jobs_cache[sid].append(
-                        {
-                            "title": row["title"] or "",
-                            "link": row["link"] or "",
-                            "location": row["location"] or "",
-                            "extra_link": row["extra_link"] or "",
-                            "first_seen": row["first_seen"],
-                        }
-                    )
-                logger.info(f"Loaded {len(rows)} jobs from database cache.")
-        except sqlite3.Error as e:
-            logger.error(f"Failed to load jobs from DB: {e}")
-
-    def _get_file_hash(self, path):
-        """Calculates the MD5 hash of a file."""
-        if not path or not os.path.exists(path):
-            return None
-        try:
-            hasher = hashlib.md5()
-            with open(path, "rb") as f:
-                for chunk in iter(lambda: f.read(4096), b""):
-                    hasher.update(chunk)
-            return hasher.hexdigest()
-        except Exception as e:
-            logger.error(f"Error calculating hash for {path}: {e}")
-            return None
-
-    def load_config(self):
-        # Check local config first
-        if os.path.exists(self.config_path):
-            pass
-        else:
-            # Fallback to mac resources
-            # self.root_dir is .../pyside
-            project_root = os.path.dirname(self.root_dir)
-            mac_config = os.path.join(project_root, "mac", "Resources", "studios.json")
-            if os.path.exists(mac_config):
-                logger.info(f"Using shared config from {mac_config}")
-                self.config_path = mac_config
-            else:
-                logger.error(f"Config file not found at {self.config_path} or {mac_config}")
+        # From here on the database is only touched by the writer thread, which also
+        # renews the lease and picks up jobs written by other processes
+        self.db_writer = DbWriter(self.store, self.lease)
+        self.db_writer.jobs_changed.connect(self._on_jobs_changed)
+        self.db_writer.search_finished.connect(self._on_search_finished)
+        self.db_writer.start()
 
-        if os.path.exists(self.config_path):
-            with open(self.config_path, "r", encoding="utf-8") as f:
-                try:
-                    raw_studios = json.load(f)
-                    studios_map = {}
-                    for s in raw_studios:
-                        if "id" in s and not s.get("disabled", False):
-                            studios_map[s["id"]] = s
-                    self.studios = list(studios_map.values())
+        # Scheduled refreshes keep running while no window is open, since this session
+        # may be the scrape leader the other sessions rely on
+        self.auto_refresh_timer = QtCore.QTimer(self)
+        self.auto_refresh_timer.timeout.connect(self.fetch_scheduled_jobs)
 
-                    # Update hash after successful read
-                    self._config_hash = self._get_file_hash(self.config_path)
+    @property
+    def scraper(self):
+        if self._scraper is None:
+            from .job_scraper import shared_scraper
 
-                    if len(self.studios) != len(raw_studios):
-                        self.save_config()
+            self._scraper = shared_scraper()
+        return self._scraper
 
-                    self.studios_refreshed.emit()
+    def _load_jobs_from_db(self):
+        """Loads the newest jobs of the enabled studios and populates the jobs cache on startup."""
+        enabled = {s.get("id") for s in self.studios if self.is_studio_enabled(s.get("id"))}
+        self.index = self.store.load_recent_index(enabled, STARTUP_JOBS_PER_STUDIO)
+        for sid in self.index.studios():
+            self.jobs_cache[sid] = self.index.studio_jobs(sid)
 
-                except json.JSONDecodeError:
-                    logger.error(f"Error decoding {self.config_path}")
-                    self.studios = []
-        else:
+    def load_config(self, result=None):
+        """
+        Reads the studio config, or applies `result` (as returned by `read_studios_cached`)
+        when the caller already read it.
+        """
+        if result is None:
+            self.config_path = resolve_config_path(self.root_dir)
+            # Unchanged configs come from the startup cache, hash included
+            result = read_studios_cached(self.config_path, VERSION)
+        if result is None:
             self.studios = []
+            return
+
+        # Entries dropped by read_studios stay in the file until the next save
+        studios, raw_count, self._config_signature, self._config_hash = result
+
+        self._set_studios(studios)
+
+    def _set_studios(self, studios, save=False):
+        """
+        Replaces the studio list and announces only what changed through `studios_delta`,
+        so cards and logos of untouched studios are kept.
+        """
+        old_logo_urls = {s.get("id"): s.get("logo_url") for s in self.studios}
+        delta = diff_studios(self.studios, studios)
+        self.studios = studios
+        if not any(delta.values()):
+            return
+        if save:
+            self._schedule_save(delta)
+
+        # Only new studios and changed logo URLs need a download
+        stale_logos = [s for s in delta["updated"] if old_logo_urls.get(s.get("id")) != s.get("logo_url")]
+        for studio in stale_logos:
+            self._remove_logo(studio.get("id"))
+        missing = [s for s in delta["added"] if not self.get_logo_path(s.get("id"))]
+        if missing or stale_logos:
+            self.download_logos(missing + stale_logos)
+
+        self.studios_delta.emit(delta)
+        self.studios_refreshed.emit()
 
     def save_config(self):
-        with open(self.config_path, "w", encoding="utf-8") as f:
-            json.dump(self.studios, f, indent=4, ensure_ascii=False)
-        # Update hash after saving
-        self._config_hash = self._get_file_hash(self.config_path)
+        """Saves every studio; see `flush_config`."""
+        self._unsaved_studios = None
+        self.flush_config()
+
+    def _schedule_save(self, delta):
+        """Saves the studios of a `diff_studios` delta once edits stop for CONFIG_SAVE_DELAY."""
+        if self._unsaved_studios is not None:
+            self._unsaved_studios.update(s.get("id") for s in delta["added"] + delta["updated"])
+            self._removed_studios.update(delta["removed"])
+        self._save_timer.start()
+
+    def flush_config(self):
+        """
+        Writes pending studio edits now. Files are replaced atomically, and in the
+        per-studio layout only the edited studios' files are written.
+        """
+        self._save_timer.stop()
+        unsaved, removed = self._unsaved_studios, self._removed_studios
+        if unsaved is not None and not unsaved and not removed:
+            return
+        self._unsaved_studios, self._removed_studios = set(), set()
+        try:
+            write_studios(self.config_path, self.studios, unsaved, removed)
+        except OSError as e:
+            logger.error(f"Failed to save {self.config_path}: {e}")
+            return
+        # Update hash after saving, so the watcher event of our own write is ignored
+        self._update_config_hash()
+
+    def _update_config_hash(self):
+        self._config_signature = config_signature(self.config_path)
+        self._config_hash = config_hash(self.config_path)
+
+    def _watch_config(self):
+        paths = [self.config_path, os.path.dirname(self.config_path)]
+        if os.path.isdir(self.config_path):
+            # Directory events only cover files being added, removed or renamed
+            paths += [entry.path for entry in os.scandir(self.config_path) if entry.name.endswith(".json")]
+        watched = set(self._config_watcher.files() + self._config_watcher.directories())
+        for path in paths:
+            if os.path.exists(path) and path not in watched:
+                self._config_watcher.addPath(path)
+
+    def reload_config_if_changed(self):
+        """
+        Reloads the studio config if its content changed since it was read or written.
+        Only stats the file(s) unless an mtime, size or inode moved, so it is cheap to
+        call before every refresh. Pending edits of this session are saved first and
+        win. Returns True if the studios were reloaded.
+        """
+        self.flush_config()
+        signature = config_signature(self.config_path)
+        if signature == self._config_signature:
+            return False
+        current_hash = config_hash(self.config_path)
+        if current_hash == self._config_hash:
+            # Touched or rewritten with the same content
+            self._config_signature = signature
+            return False
+        result = read_studios(self.config_path)
+        if result is None:
+            # Half-saved or broken by hand: keep the current studios until it reads again
+            return False
+
+        logger.info("Config file change detected. Reloading studios...")
+        # Reuse this read and hash instead of reading the config again
+        result += (signature, current_hash)
+        write_studios_cache(self.config_path, VERSION, result)
+        self.load_config(result)
+        return True
+
+    def _on_config_file_changed(self):
+        self._watch_config()
+        self.reload_config_if_changed()
 
     def get_studios(self):
         return self.studios
@@ -203,6 +284,33 @@ class ConfigManager(QtCore.QObject):
     def get_studio_jobs(self, studio_id):
         return self.jobs_cache.get(studio_id, [])
 
+    def get_studio_job_count(self, studio_id):
+        """Number of stored jobs, including the ones not loaded yet."""
+        return self.index.job_count(studio_id)
+
+    def ensure_jobs_loaded(self, studio_ids):
+        """Requests the full history of partly loaded studios, `jobs_delta` follows once read."""
+        for sid in studio_ids:
+            if not self.index.is_loaded(sid) and sid not in self._loading_studios:
+                self._loading_studios.add(sid)
+                self.db_writer.load_studio(sid)
+
+    def search_jobs(self, text):
+        """
+        Starts a full-text search of the whole job history, answered by `search_finished`.
+        Returns False if the text has to be matched as a regular expression instead.
+        """
+        query = fts_query(text) if self.store.has_fts else None
+        if query is None:
+            return False
+        self.db_writer.search(text, query)
+        return True
+
+    def _on_search_finished(self, text, matches):
+        # Hits can be in the part of a studio's history that is not loaded yet
+        self.ensure_jobs_loaded([sid for sid in matches if self.is_studio_enabled(sid)])
+        self.search_finished.emit(text, matches)
+
     def is_studio_enabled(self, studio_id):
         return studio_id not in self.disabled_studios
 
@@ -215,6 +323,9 @@ class ConfigManager(QtCore.QObject):
                 self.disabled_studios.append(studio_id)
 
         self.settings.setValue("disabled_studios", self.disabled_studios)
+        self._sync_worker_state()
+        if enabled:
+            self.ensure_jobs_loaded([studio_id])
         self.studio_visibility_changed.emit(studio_id, enabled)
 
     def enable_all_studios(self):
@@ -225,6 +336,8 @@ class ConfigManager(QtCore.QObject):
                 self.disabled_studios.remove(sid)
 
         self.settings.setValue("disabled_studios", self.disabled_studios)
+        self._sync_worker_state()
+        self.ensure_jobs_loaded([s.get("id") for s in self.studios])
         self.studios_visibility_changed.emit()
 
     def disable_all_studios(self):
@@ -235,39 +348,19 @@ class ConfigManager(QtCore.QObject):
                 self.disabled_studios.append(sid)
 
         self.settings.setValue("disabled_studios", self.disabled_studios)
+        self._sync_worker_state()
         self.studios_visibility_changed.emit()
 
     def add_studio(self, studio_data):
-        # Check if exists and remove first
+        # Replaces a studio with the same id
         check_id = studio_data.get("id")
-        existing_index = -1
-        for i, s in enumerate(self.studios):
-            if s.get("id") == check_id:
-                existing_index = i
-                break
-
-        if existing_index != -1:
-            self.studios.pop(existing_index)
-
-        self.studios.append(studio_data)
-        self.save_config()
-        # Auto download logo for new studio
-        self.download_logos([studio_data])
-        self.studios_refreshed.emit()
+        self._set_studios([s for s in self.studios if s.get("id") != check_id] + [studio_data], save=True)
 
     def update_studio(self, studio_data):
         """Updates an existing studio's data."""
-        updated = False
-        for i, studio in enumerate(self.studios):
-            if studio.get("id") == studio_data.get("id"):
-                self.studios[i] = studio_data
-                updated = True
-                break
-
-        if updated:
-            self.save_config()
-            self.refresh_studio_logo(studio_data)
-            self.studios_refreshed.emit()
+        sid = studio_data.get("id")
+        if any(s.get("id") == sid for s in self.studios):
+            self._set_studios([studio_data if s.get("id") == sid else s for s in self.studios], save=True)
 
     def download_missing_logos(self):
         """Checks for missing logos and downloads them in a thread."""
@@ -300,17 +393,18 @@ class ConfigManager(QtCore.QObject):
 
     def refresh_studio_logo(self, studio_data):
         """Refreshes a specific studio logo."""
-        sid = studio_data.get("id")
-        # Remove existing
-        path = self.get_logo_path(sid)
+        self._remove_logo(studio_data.get("id"))
+        self.download_logos([studio_data])
+
+    def _remove_logo(self, studio_id):
+        path = self.get_logo_path(studio_id)
         if path and os.path.exists(path):
             try:
                 os.remove(path)
             except OSError:
                 pass
 
-        self.logo_cleared.emit(sid)
-        self.download_logos([studio_data])
+        self.logo_cleared.emit(studio_id)
 
     def download_logos(self, studios_to_download):
         if self.logo_worker and self.logo_worker.isRunning():
@@ -330,174 +424,198 @@ class ConfigManager(QtCore.QObject):
             return path
         return None
 
+    def logo_pixmap(self, studio_id):
+        """
+        The studio's logo scaled to LOGO_SIZE, or None if it has no readable logo. A logo
+        not decoded yet is an empty pixmap, and `logo_loaded` follows once it is ready.
+        """
+        path = self.get_logo_path(studio_id)
+        try:
+            st = os.stat(path) if path else None
+        except OSError:
+            st = None
+        if st is None:
+            self._logos.pop(studio_id, None)
+            return None
+
+        key = (st.st_mtime_ns, st.st_size)
+        cached = self._logos.get(studio_id)
+        if cached and cached[0] == key:
+            return cached[1]
+        if self._logo_requests.get(studio_id) != key:
+            self._logo_requests[studio_id] = key
+            self.logo_loader.load(studio_id, key, path)
+        return QtGui.QPixmap()
+
+    def _on_logo_loaded(self, studio_id, key, image):
+        if self._logo_requests.get(studio_id) != key:
+            # The file changed again in the meantime, a newer request is queued
+            return
+        del self._logo_requests[studio_id]
+        self._logos[studio_id] = (key, None if image.isNull() else QtGui.QPixmap.fromImage(image))
+        self.logo_loaded.emit(studio_id)
+
     # --- Job Fetching ---
 
     def fetch_all_jobs(self):
-        # Check for config updates before refetching everything
-        current_hash = self._get_file_hash(self.config_path)
-        if current_hash != self._config_hash:
-            logger.info("Config file change detected via MD5. Reloading studios...")
-            self.load_config()
-            self.download_missing_logos()
+        # Edits are normally picked up by the file watcher already; this stat check also
+        # catches the ones it misses (e.g. on network shares)
+        self.reload_config_if_changed()
 
         active_studios = [s for s in self.studios if not s.get("disabled", False)]
         self.start_job_worker(active_studios)
 
-    def fetch_studio_jobs(self, studio_data):
-        # Check for config updates before refetching
-        current_hash = self._get_file_hash(self.config_path)
-        if current_hash != self._config_hash:
-            logger.info("Config file change detected via MD5. Reloading studios...")
-            self.load_config()
-            self.download_missing_logos()
-
-        self.start_job_worker([studio_data])
-
-    def start_job_worker(self, studios):
-        if self.job_worker and self.job_worker.isRunning():
-            # Ensure previous worker is stopped before starting new one
-            self.job_worker.stop()
-            self.job_worker.wait()
-
-        # Emit started signal for all involved
-        for s in studios:
-            self.jobs_started.emit(s.get("id"))
-
-        self.job_worker = JobWorker(studios, self.scraper)
-        self.job_worker.jobs_ready.connect(self._on_jobs_ready)
-        self.job_worker.jobs_failed.connect(self.jobs_failed.emit)
-        self.job_worker.start()
-
-    def _on_jobs_ready(self, studio_id, jobs):
-        try:
-            # 1. Fetch existing history to determine 'first_seen' status
-            existing_history = self._fetch_studio_history(studio_id)
-
-            # 2. Sync results to DB (Upsert new, update existing, remove stale)
-            processed_jobs = self._sync_studio_jobs(studio_id, jobs, existing_history)
-
-            # 3. Sort by newness and update UI
-            processed_jobs.sort(key=lambda x: float(x.get("first_seen", 0)), reverse=True)
+    def fetch_scheduled_jobs(self):
+        """Scheduled refresh: only the scrape leader hits the network, followers read its results."""
+        if self.lease.held:
+            self.fetch_all_jobs()
+
+    def fetch_stale_jobs(self, max_age=FRESH_JOBS_AGE):
+        """Like `fetch_scheduled_jobs`, but skips studios scraped in the last `max_age` seconds."""
+        if not self.lease.held:
+            return
+        self.reload_config_if_changed()
+
+        scraped = self.index.last_scrape_times()
+        scraped.update(self._last_scrape_times)
+        cutoff = time.time() - max_age
+        stale = [s for s in self.studios if not s.get("disabled", False) and scraped.get(s.get("id"), 0) < cutoff]
+        if stale:
+            self.start_job_worker(stale)
+        logger.info(f"Refreshing {len(stale)} of {len(self.studios)} studios older than {max_age // 60} min.")
 
-            self.jobs_cache[studio_id] = processed_jobs
-            self.jobs_updated.emit(studio_id, processed_jobs)
-
-        except Exception as e:
-            logger.error(f"Error processing jobs for {studio_id}: {e}")
-            self.jobs_failed.emit(studio_id, str(e))
+    def fetch_studio_jobs(self, studio_data):
+        self.reload_config_if_changed()
 
-    def _fetch_studio_history(self, studio_id):
-        """Fetches existing persistence data (job_hash -> first_seen) for a studio."""
-        try:
-            with self._get_db_connection() as conn:
-                cursor = conn.cursor()
-                cursor.execute("SELECT job_hash, first_seen FROM jobs WHERE studio_id = ?", (studio_id,))
-                return {row["job_hash"]: row["first_seen"] for row in cursor.fetchall()}
-        except sqlite3.Error as e:
-            logger.error(f"Failed to fetch history for {studio_id}: {e}")
-            return {}
+        self.start_job_worker([studio_data], force=True)
 
-    def _sync_studio_jobs(self, studio_id, jobs, existing_history):
+    def start_job_worker(self, studios, force=False):
         """
-        Updates the database with the current scrape results and cleanup stale ones.
-        Returns the full list of active jobs (seen in last 7 days) for the studio.
+        Queues studios on the persistent job worker. Studios already queued or in
+        flight are merged instead of restarting the running refresh.
         """
-        now_ts = datetime.now().timestamp()
-        day_7_threshold = now_ts - (7 * 86400)
-        jobs_to_upsert = []
-
-        for job in jobs:
-            # Generate deterministic hash
-            j_link = job.get("link", "")
-            j_title = job.get("title", "")
-            raw_key = f"{j_link}|{j_title}"
-            job_hash = hashlib.md5(raw_key.encode("utf-8")).hexdigest()
-
-            # Preserve original first_seen if exists, otherwise mark as new
-            first_seen = existing_history.get(job_hash, now_ts)
-
-            # Prepare for DB batch update (Upsert signature)
-            jobs_to_upsert.append(
-                (
-                    job_hash,
-                    studio_id,
-                    job.get("title", ""),
-                    job.get("link", ""),
-                    job.get("location", ""),
-                    job.get("extra_link", ""),
-                    first_seen,
-                    now_ts,
-                )
-            )
-
+        if self.job_worker is None or not self.job_worker.is_active():
+            if self.use_scrape_process:
+                self.job_worker = JobProcess(self.root_dir)
+            else:
+                self.job_worker = JobWorker(self.scraper, state_hint=self._scrape_state_hint)
+                self.job_worker.start()
+            self.job_worker.seed_history(self._last_scrape_times, self._load_scrape_latency())
+            self.job_worker.jobs_ready.connect(self._on_jobs_ready)
+            self.job_worker.jobs_failed.connect(self.jobs_failed.emit)
+            self.job_worker.jobs_started.connect(self.jobs_started.emit)
+            self._sync_worker_state()
+
+        self.job_worker.enqueue(studios, force=force)
+
+    def set_auto_refresh_interval(self, ms):
+        """Runs `fetch_scheduled_jobs` every `ms` milliseconds, or never if None."""
+        if ms is None:
+            self.auto_refresh_timer.stop()
+        elif not self.auto_refresh_timer.isActive() or self.auto_refresh_timer.interval() != ms:
+            self.auto_refresh_timer.start(ms)
+
+    def set_scrape_process_enabled(self, enabled):
+        """Switches between in-process threads and the out-of-process scrape service."""
+        enabled = bool(enabled)
+        if enabled == self.use_scrape_process:
+            return
+        self.use_scrape_process = enabled
+        self.settings.setValue("scrape_in_subprocess", enabled)
+
+        # The next refresh starts the other kind of worker
+        if self.job_worker:
+            self.settings.setValue("scrape_latency", self.job_worker.latency_snapshot())
+            try:
+                self.job_worker.jobs_ready.disconnect()
+            except (RuntimeError, TypeError):
+                pass
+            self.job_worker.stop()
+            if isinstance(self.job_worker, JobWorker):
+                # The dispatch loop exits within one poll interval
+                self.job_worker.wait()
+            self.job_worker = None
+
+    def _sync_worker_state(self):
+        if isinstance(self.job_worker, JobProcess) and self.job_worker.is_active():
+            self.job_worker.update_state(self.disabled_studios, self._visible_studios)
+
+    def set_visible_studios(self, studio_ids):
+        """Records which studio cards are on screen so their refreshes are dispatched first."""
+        self._visible_studios = frozenset(studio_ids)
+        self._sync_worker_state()
+
+    def _scrape_state_hint(self, studio_id):
+        """Called from the worker thread to rank queued studios."""
+        return self.is_studio_enabled(studio_id), studio_id in self._visible_studios
+
+    def _load_scrape_latency(self):
+        latency = self.settings.value("scrape_latency", {}) or {}
+        if not isinstance(latency, dict):
+            return {}
         try:
-            with self._get_db_connection() as conn:
-                cursor = conn.cursor()
-
-                # 1. Upsert: Insert new jobs or update last_seen/data for existing ones
-                if jobs_to_upsert:
-                    cursor.executemany(
-                        """
-                        INSERT INTO jobs (job_hash, studio_id, title, link, location, extra_link, first_seen, last_seen)
-                        VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-                        ON CONFLICT(job_hash) DO UPDATE SET
-                            title = excluded.title,
-                            link = excluded.link,
-                            location = excluded.location,
-                            extra_link = excluded.extra_link,
-                            last_seen = excluded.last_seen
-                    """,
-                        jobs_to_upsert,
-                    )
-
-                # 2. Cleanup: Remove jobs older than 7 days
-                cursor.execute(
-                    "DELETE FROM jobs WHERE studio_id = ? AND last_seen < ?", (studio_id, day_7_threshold)
-                )
-
-                # 3. Fetch current state (all jobs seen in last 7 days)
-                cursor.execute(
-                    """
-                    SELECT title, link, location, extra_link, first_seen 
-                    FROM jobs 
-                    WHERE studio_id = ?
-                    ORDER BY first_seen DESC
-                """,
-                    (studio_id,),
-                )
-
-                rows = cursor.fetchall()
-                conn.commit()
-
-                processed_jobs = []
-                for row in rows:
-                    processed_jobs.append(
-                        {
-                            "title": row["title"] or "",
-                            "link": row["link"] or "",
-                            "location": row["location"] or "",
-                            "extra_link": row["extra_link"] or "",
-                            "first_seen": row["first_seen"],
-                        }
-                    )
-                return processed_jobs
-
-        except sqlite3.Error as e:
-            logger.error(f"DB Sync failed for {studio_id}: {e}")
-            return []
+            return {sid: float(v) for sid, v in latency.items()}
+        except (TypeError, ValueError):
+            return {}
+
+    def _on_jobs_ready(self, studio_id, jobs):
+        if not self.index.is_loaded(studio_id):
+            # Syncing needs the whole history, finish once it has been read
+            self._pending_results[studio_id] = jobs
+            self.ensure_jobs_loaded([studio_id])
+            return
+
+        # Sync against the in-memory index (new, updated and stale jobs); the DB write happens behind
+        processed_jobs, changes = self.index.sync(studio_id, jobs)
+        self.db_writer.submit(changes, self._next_generation(studio_id))
+
+        self._last_scrape_times[studio_id] = time.time()
+        self._set_studio_jobs(studio_id, processed_jobs)
+
+    def _next_generation(self, studio_id):
+        generation = self._generations[studio_id] = self._generations.get(studio_id, 0) + 1
+        return generation
+
+    def _on_jobs_changed(self, studio_id, jobs, last_seen, gone, generation):
+        """Jobs of a studio were read from jobs.db, after a change by another process or on request."""
+        if generation < self._generations.get(studio_id, 0):
+            # Read before the index's latest write of the studio was committed: applying
+            # it would roll the index back. Read once more behind that write, so a change
+            # by another process that came with it is not lost.
+            if studio_id in self._loading_studios:
+                self._loading_studios.discard(studio_id)
+            else:
+                self._loading_studios.add(studio_id)
+                self.db_writer.load_studio(studio_id)
+            return
+        self.index.set_studio(studio_id, jobs, last_seen, gone)
+        self._loading_studios.discard(studio_id)
+        if studio_id in self._pending_results:
+            self._on_jobs_ready(studio_id, self._pending_results.pop(studio_id))
+        elif jobs != self.jobs_cache.get(studio_id, []):
+            self._set_studio_jobs(studio_id, jobs)
+
+    def _set_studio_jobs(self, studio_id, jobs):
+        # Diff against what the UI currently shows so widgets can patch in place
+        delta = diff_jobs(self.jobs_cache.get(studio_id, []), jobs)
+        self.jobs_cache[studio_id] = jobs
+        self.jobs_updated.emit(studio_id, jobs)
+        self.jobs_delta.emit(studio_id, delta)
 
     def _clear_studio_history(self, studio_id):
-        try:
-            with self._get_db_connection() as conn:
-                conn.execute("DELETE FROM jobs WHERE studio_id = ?", (studio_id,))
-                conn.commit()
-        except sqlite3.Error:
-            pass
+        self._pending_results.pop(studio_id, None)
+        self.index.drop_studio(studio_id)
+        self.db_writer.clear_studio(studio_id, self._next_generation(studio_id))
 
     def cleanup(self):
         """Stops any running workers and prevents further updates."""
         # Stop this object from sending any more signals to the UI
         self.blockSignals(True)
+        self.flush_config()
+
+        # Commit pending results; the writer then hands scheduled scraping over
+        # to another session by releasing the lease
+        self.db_writer.stop()
 
         if self.logo_worker:
             try:
@@ -508,12 +626,23 @@ class ConfigManager(QtCore.QObject):
                 self.logo_worker.stop()
 
         if self.job_worker:
+            # Keep host latency so the next session can start slow studios first
+            self.settings.setValue("scrape_latency", self.job_worker.latency_snapshot())
             try:
                 self.job_worker.jobs_ready.disconnect()
             except (RuntimeError, TypeError):
                 pass
-            if self.job_worker.isRunning():
-                self.job_worker.stop()
+            self.job_worker.stop()
+            if isinstance(self.job_worker, QtCore.QThread):
+                # dispatch() notices within 0.2 s; Qt aborts on a thread destroyed while running
+                self.job_worker.wait(2000)
+
+        self.auto_refresh_timer.stop()
+        self.logo_loader.stop()
+        self.logo_loader.wait(1000)
+
+        if self.db_writer.wait(2000):
+            self.store.close()
 
         logger.info("ConfigManager cleanup complete: Workers signaled to stop and signals disconnected.")
 
@@ -521,56 +650,184 @@ class ConfigManager(QtCore.QObject):
 class JobWorker(QtCore.QThread):
     jobs_ready = QtCore.Signal(str, list)  # studio_id, list of job dicts
     jobs_failed = QtCore.Signal(str, str)  # studio_id, error_message
+    jobs_started = QtCore.Signal(str)  # studio_id
     finished = QtCore.Signal()
 
-    def __init__(self, studios, scraper, parent=None):
+    def __init__(self, scraper, state_hint=None, parent=None):
         super(JobWorker, self).__init__(parent)
-        self.studios = studios
         self.scraper = scraper
+        self.queue = ScrapeQueue(state_hint=state_hint)
         self._is_running = True
 
+    def enqueue(self, studios, force=False):
+        """Queues studios and emits jobs_started for the ones that were not already pending."""
+        for s in self.queue.enqueue(studios, force=force):
+            self.jobs_started.emit(s.get("id"))
+
+    def seed_history(self, last_success, latency):
+        self.queue.seed_history(last_success, latency)
+
+    def latency_snapshot(self):
+        return self.queue.latency_snapshot()
+
     def run(self):
-        import concurrent.futures
+        from .job_scraper import parse_jobs
 
-        # Determine max workers based on list size, but cap it (e.g. 10 or 20) to avoid too many threads
-        max_workers = min(len(self.studios), 20)
-        if max_workers < 1:
-            max_workers = 1
+        dispatch(
+            self.queue,
+            self.scraper.fetch_payloads,
+            self._on_ready,
+            self._on_failed,
+            self.is_active,
+            parse=parse_jobs,
+        )
 
-        executor = concurrent.futures.ThreadPoolExecutor(max_workers=max_workers)
-        future_to_studio = {
-            executor.submit(self.scraper.fetch_jobs, studio): studio for studio in self.studios
-        }
-        pending = set(future_to_studio.keys())
+        if self._is_running:
+            self.finished.emit()
 
-        while pending and self._is_running:
-            try:
-                done, _ = concurrent.futures.wait(
-                    pending, timeout=0.2, return_when=concurrent.futures.FIRST_COMPLETED
-                )
+    def _on_ready(self, studio_id, rows, latency):
+        from .job_scraper import jobs_from_tuples
 
-                for future in done:
-                    pending.remove(future)
-                    studio = future_to_studio[future]
-                    try:
-                        jobs = future.result()
-                        if self._is_running:
-                            self.jobs_ready.emit(studio.get("id"), jobs)
-                    except Exception as e:
-                        if self._is_running:
-                            logger.error(f"Error processing jobs for {studio.get('name', 'Unknown')}: {e}")
-                            self.jobs_failed.emit(studio.get("id"), str(e))
-            except Exception:
-                pass
+        self.jobs_ready.emit(studio_id, jobs_from_tuples(rows))
 
-        if not self._is_running:
-            for f in pending:
-                f.cancel()
+    def _on_failed(self, studio_id, error, latency):
+        self.jobs_failed.emit(studio_id, error)
 
-        executor.shutdown(wait=False)
+    def is_active(self):
+        return self._is_running
+
+    def stop(self):
+        self._is_running = False
+        self.queue.clear()
 
-        if self._is_running:
-            self.finished.emit()
+
+class JobProcess(QtCore.QObject):
+    """
+    Drop-in replacement for JobWorker that runs the scraper in a child process
+    (see scrape_service.py) so parsing does not hold the GIL of the host application.
+    """
+
+    jobs_ready = QtCore.Signal(str, list)  # studio_id, list of job dicts
+    jobs_failed = QtCore.Signal(str, str)  # studio_id, error_message
+    jobs_started = QtCore.Signal(str)  # studio_id
+
+    def __init__(self, root_dir, parent=None):
+        super(JobProcess, self).__init__(parent)
+        self._outstanding = set()
+        self._latency = {}
+        self._buffer = b""
+        self._is_running = True
+
+        package = __name__.rsplit(".", 2)[0]
+        env = QtCore.QProcessEnvironment.systemEnvironment()
+        python_path = [os.path.dirname(root_dir)]
+        if env.contains("PYTHONPATH"):
+            python_path.append(env.value("PYTHONPATH"))
+        env.insert("PYTHONPATH", os.pathsep.join(python_path))
+
+        self.process = QtCore.QProcess(self)
+        self.process.setProcessEnvironment(env)
+        self.process.setProcessChannelMode(QtCore.QProcess.ForwardedErrorChannel)
+        self.process.readyReadStandardOutput.connect(self._on_output)
+        self.process.finished.connect(self._on_process_finished)
+        self.process.start(get_python_executable(), ["-m", package + ".core.scrape_service"])
+
+    def is_active(self):
+        return self._is_running and self.process.state() != QtCore.QProcess.NotRunning
+
+    def _send(self, message):
+        self.process.write((json.dumps(message) + "\n").encode("utf-8"))
+
+    def enqueue(self, studios, force=False):
+        self._send({"cmd": "enqueue", "studios": studios, "force": force})
+
+    def update_state(self, disabled, visible):
+        self._send({"cmd": "state", "disabled": list(disabled), "visible": list(visible)})
+
+    def seed_history(self, last_success, latency):
+        self._latency.update(latency or {})
+        self._send({"cmd": "seed", "last_success": last_success, "latency": latency})
+
+    def latency_snapshot(self):
+        return dict(self._latency)
+
+    def _on_output(self):
+        self._buffer += bytes(self.process.readAllStandardOutput())
+        *lines, self._buffer = self._buffer.split(b"\n")
+        for line in lines:
+            if not line.strip():
+                continue
+            try:
+                self._handle(json.loads(line.decode("utf-8")))
+            except ValueError as e:
+                logger.error(f"Invalid message from scrape service: {e}")
+
+    def _handle(self, message):
+        if not self._is_running:
+            return
+        event = message.get("event")
+        if event == "started":
+            for sid in message.get("ids", []):
+                self._outstanding.add(sid)
+                self.jobs_started.emit(sid)
+            return
+
+        sid = message.get("id")
+        self._outstanding.discard(sid)
+        if message.get("latency") is not None:
+            prev = self._latency.get(sid)
+            latency = message["latency"]
+            self._latency[sid] = latency if prev is None else 0.7 * prev + 0.3 * latency
+
+        if event == "ready":
+            from .job_scraper import jobs_from_tuples
+
+            self.jobs_ready.emit(sid, jobs_from_tuples(message.get("jobs", [])))
+        elif event == "failed":
+            self.jobs_failed.emit(sid, message.get("error", ""))
+
+    def _on_process_finished(self, *args):
+        if not self._is_running:
+            return
+        self._is_running = False
+        logger.error("Scrape service exited unexpectedly.")
+        for sid in sorted(self._outstanding):
+            self.jobs_failed.emit(sid, "Scrape service exited unexpectedly")
+        self._outstanding.clear()
 
     def stop(self):
+        if not self._is_running:
+            return
         self._is_running = False
+        if self.process.state() != QtCore.QProcess.NotRunning:
+            self._send({"cmd": "stop"})
+            self.process.closeWriteChannel()
+            # Give the service a moment to exit on its own before killing it
+            if not self.process.waitForFinished(1000):
+                self.process.kill()
+
+
+# Outlives the windows using it, see `shared_config_manager`
+_shared_config_manager = None
+
+
+def shared_config_manager():
+    """
+    The ConfigManager of this process, created on first use and kept until the
+    application quits, so reopening the window reuses its jobs, workers and lease.
+    """
+    global _shared_config_manager
+    if _shared_config_manager is None:
+        _shared_config_manager = ConfigManager()
+        app = QtCore.QCoreApplication.instance()
+        if app:
+            app.aboutToQuit.connect(release_shared_config_manager)
+    return _shared_config_manager
+
+
+def release_shared_config_manager():
+    """Cleans up the shared ConfigManager, on quit or before JobUI is re-imported."""
+    global _shared_config_manager
+    if _shared_config_manager is not None:
+        _shared_config_manager.cleanup()
+        _shared_config_manager = None
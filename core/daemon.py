@@ -0,0 +1,249 @@
+"""
+Headless scraping daemon.
+
+Scrapes every studio in studios.json on a schedule and writes the results to
+config/jobs.db, so the UI only has to read the database.
+
+    python -m JobUI.core.daemon --once
+    python -m JobUI.core.daemon --interval 600
+"""
+
+import argparse
+import logging
+import os
+import signal
+import sys
+import threading
+import time
+
+from .logger import logger
+from .job_store import JobStore
+from .scrape_queue import ScrapeQueue, dispatch
+from .scrape_lease import ScrapeLease, LEASE_HEARTBEAT, PRIORITY_DAEMON
+from .studio_config import resolve_config_path, read_studios
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_INTERVAL = 10 * 60
+
+
+class PidLock:
+    """
+    Exclusive PID file. A file left behind by a process that no longer exists is
+    treated as stale and taken over.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._owned = False
+
+    def acquire(self):
+        for _ in range(2):
+            try:
+                fd = os.open(self.path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+            except FileExistsError:
+                pid = self.read_pid()
+                if pid and _pid_alive(pid):
+                    return False
+                logger.info(f"Removing stale PID file {self.path} (pid {pid})")
+                try:
+                    os.remove(self.path)
+                except OSError:
+                    return False
+                continue
+
+            with os.fdopen(fd, "w") as f:
+                f.write(str(os.getpid()))
+            self._owned = True
+            return True
+        return False
+
+    def read_pid(self):
+        try:
+            with open(self.path, "r") as f:
+                return int(f.read().strip() or 0)
+        except (OSError, ValueError):
+            return None
+
+    def release(self):
+        if self._owned and self.read_pid() == os.getpid():
+            try:
+                os.remove(self.path)
+            except OSError:
+                pass
+        self._owned = False
+
+
+def _pid_alive(pid):
+    if pid == os.getpid():
+        return True
+    if os.name == "nt":
+        import ctypes
+
+        PROCESS_QUERY_LIMITED_INFORMATION = 0x1000
+        handle = ctypes.windll.kernel32.OpenProcess(PROCESS_QUERY_LIMITED_INFORMATION, False, pid)
+        if not handle:
+            return False
+        ctypes.windll.kernel32.CloseHandle(handle)
+        return True
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+class ScrapeDaemon:
+    def __init__(self, config_path=None, db_path=None):
+        self.config_path = config_path
+        self.store = JobStore(db_path or os.path.join(ROOT_DIR, "config", "jobs.db"))
+        self.queue = ScrapeQueue()
+        self.queue.seed_history(self.store.last_scrape_times())
+        # Takes scheduled scraping over from UI sessions while the daemon runs
+        self.lease = ScrapeLease(self.store, priority=PRIORITY_DAEMON)
+        self._stop = threading.Event()
+        self._scraper = None
+        self._heartbeat = None
+
+    @property
+    def scraper(self):
+        if self._scraper is None:
+            from .job_scraper import JobScraper
+
+            self._scraper = JobScraper()
+        return self._scraper
+
+    def fetch_payloads(self, studio):
+        """`JobScraper.fetch_payloads`, raising when none of the studio's careers pages responded."""
+        payloads = self.scraper.fetch_payloads(studio)
+        urls = studio.get("careers_url")
+        if not payloads and (any(urls) if isinstance(urls, list) else urls):
+            # The scraper only logs request errors, an empty result here is not "no jobs"
+            raise RuntimeError("No careers page could be fetched")
+        return payloads
+
+    def load_studios(self):
+        path = self.config_path or resolve_config_path(ROOT_DIR)
+        result = read_studios(path)
+        if result is None:
+            return []
+        return result[0]
+
+    def run_cycle(self):
+        """Scrapes every studio once. Returns (succeeded, failed) counts."""
+        from .job_scraper import jobs_from_tuples, parse_jobs
+
+        if not self.lease.renew():
+            logger.error("Another daemon holds the scrape lease, skipping cycle.")
+            return 0, 0
+
+        studios = self.load_studios()
+        if not studios:
+            logger.error("No studios to scrape.")
+            return 0, 0
+
+        counts = {"ok": 0, "failed": 0}
+
+        def on_ready(studio_id, rows, latency):
+            if studio_id not in self.store.sync_many([(studio_id, jobs_from_tuples(rows))]):
+                # sync_many logged the database error
+                counts["failed"] += 1
+                return
+            counts["ok"] += 1
+            logger.info(f"{studio_id}: {len(rows)} jobs ({latency:.1f}s)")
+
+        def on_failed(studio_id, error, latency):
+            counts["failed"] += 1
+            logger.error(f"{studio_id}: {error}")
+
+        start = time.monotonic()
+        self.queue.enqueue(studios, force=True)
+        dispatch(
+            self.queue,
+            self.fetch_payloads,
+            on_ready,
+            on_failed,
+            lambda: not self._stop.is_set() and not self.queue.is_idle(),
+            parse=parse_jobs,
+        )
+        self.queue.clear()
+
+        logger.info(
+            f"Cycle finished in {time.monotonic() - start:.1f}s: "
+            f"{counts['ok']} studios updated, {counts['failed']} failed."
+        )
+
+        # Idle until the next cycle, a good time for housekeeping
+        self.store.maintain(should_yield=self._stop.is_set)
+        return counts["ok"], counts["failed"]
+
+    def start_heartbeat(self):
+        """Keeps the scrape lease renewed from a background thread."""
+
+        def beat():
+            while not self._stop.wait(LEASE_HEARTBEAT):
+                self.lease.renew()
+
+        self._heartbeat = threading.Thread(target=beat, daemon=True)
+        self._heartbeat.start()
+
+    def run_forever(self, interval):
+        while not self._stop.is_set():
+            self.run_cycle()
+            self._stop.wait(interval)
+
+    def stop(self, *args):
+        if not self._stop.is_set():
+            logger.info("Shutdown requested, finishing current results...")
+        self._stop.set()
+        self.queue.wake()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Headless JobUI scraping daemon.")
+    parser.add_argument("--once", action="store_true", help="Run a single refresh cycle and exit.")
+    parser.add_argument(
+        "--interval",
+        type=float,
+        default=DEFAULT_INTERVAL,
+        help="Seconds between refresh cycles (default: %(default)s).",
+    )
+    parser.add_argument("--config", help="Path to studios.json or a per-studio directory (default: config/studios/ or config/studios.json).")
+    parser.add_argument("--db", help="Path to jobs.db (default: config/jobs.db).")
+    parser.add_argument(
+        "--pid-file",
+        default=os.path.join(ROOT_DIR, "config", "jobui_daemon.pid"),
+        help="Lock file preventing two daemons from running (default: %(default)s).",
+    )
+    parser.add_argument("-v", "--verbose", action="store_true", help="Log every studio result.")
+    args = parser.parse_args(argv)
+
+    if args.verbose:
+        logger.setLevel(logging.INFO)
+
+    lock = PidLock(args.pid_file)
+    if not lock.acquire():
+        logger.error(f"Another daemon is already running (pid {lock.read_pid()}, {args.pid_file}).")
+        return 1
+
+    daemon = ScrapeDaemon(config_path=args.config, db_path=args.db)
+    for sig_name in ("SIGINT", "SIGTERM", "SIGBREAK"):
+        if hasattr(signal, sig_name):
+            signal.signal(getattr(signal, sig_name), daemon.stop)
+
+    daemon.start_heartbeat()
+    try:
+        if args.once:
+            ok, failed = daemon.run_cycle()
+            return 0 if ok or not failed else 2
+        daemon.run_forever(max(1.0, args.interval))
+        return 0
+    finally:
+        daemon.lease.release()
+        daemon.store.close()
+        lock.release()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,237 @@
+import threading
+import time
+
+from .logger import logger
+from .scrape_lease import LEASE_HEARTBEAT
+
+try:
+    from PySide2 import QtCore
+except ImportError:
+    from PySide6 import QtCore
+
+
+# Results arriving within this window are committed in the same transaction
+BATCH_WINDOW = 0.25
+
+# How often jobs.db is checked for commits made by other processes
+WATCH_INTERVAL = 2.0
+
+# Housekeeping (retention, vacuum, optimize, checkpoint) runs this long after startup,
+# then every MAINTENANCE_INTERVAL, and only while nothing is queued
+MAINTENANCE_DELAY = 60.0
+MAINTENANCE_INTERVAL = 15 * 60.0
+
+# A batch that fails to commit (locked, read-only or full disk) is retried after
+# RETRY_DELAY, doubling each time, and dropped after WRITE_RETRIES attempts
+RETRY_DELAY = 1.0
+WRITE_RETRIES = 5
+
+
+class DbWriter(QtCore.QThread):
+    """
+    Owns every database access made while the UI is running. Scrape results are
+    synced against ConfigManager's JobIndex in memory; the resulting change sets
+    are written behind here, batched into one transaction per BATCH_WINDOW. The
+    scrape lease is renewed and jobs.db is polled for changes from other sessions
+    on this thread too, so the UI thread never waits on SQLite locks. While it holds
+    the lease it also runs `JobStore.maintain` when idle.
+    """
+
+    # studio_id, jobs, {job_hash: last_seen}, [job_hash gone from the site] changed by another
+    # process or read by `load_studio`, and the generation of the last write of the studio
+    # committed before the read
+    # (the dict has integer keys, which Qt cannot convert, so it goes through as an object)
+    jobs_changed = QtCore.Signal(str, list, object, object, int)
+    search_finished = QtCore.Signal(str, object)  # search text, {studio_id: {job_hash: rank}}
+
+    def __init__(self, store, lease=None, parent=None):
+        super(DbWriter, self).__init__(parent)
+        self.store = store
+        self.lease = lease
+        self._cond = threading.Condition()
+        # [("write", (changes, generation)) | ("clear", (studio_id, generation)) | ("load", studio_id)
+        #  | ("search", (text, query))]
+        self._ops = []
+        self._is_running = True
+        self._db_version = None
+        self._signatures = {}
+        self._failed = []  # (changes, generation) waiting for a retry, oldest first
+        self._written = {}  # {studio_id: generation of the last write committed}
+        self._attempts = 0
+        self._retry_at = 0.0
+
+    def submit(self, changes, generation=0):
+        """
+        Queues a change set returned by `JobIndex.sync`. `generation` is the caller's count
+        of changes to the studio, it tags the reads of the studio made once it is committed.
+        """
+        self._push(("write", (changes, generation)))
+
+    def clear_studio(self, studio_id, generation=0):
+        self._push(("clear", (studio_id, generation)))
+
+    def load_studio(self, studio_id):
+        """Reads a studio's full job history, delivered through `jobs_changed`."""
+        self._push(("load", studio_id))
+
+    def search(self, text, query):
+        """Runs a full-text query after the writes queued before it, answered by `search_finished`."""
+        self._push(("search", (text, query)))
+
+    def _push(self, op):
+        with self._cond:
+            self._ops.append(op)
+            self._cond.notify()
+
+    def stop(self):
+        """Stops after committing whatever is still queued."""
+        with self._cond:
+            self._is_running = False
+            self._cond.notify()
+
+    def run(self):
+        self._db_version = self.store.data_version()
+        self._signatures = self.store.studio_signatures()
+        next_beat = time.monotonic() + LEASE_HEARTBEAT
+        next_watch = time.monotonic() + WATCH_INTERVAL
+        next_maintenance = time.monotonic() + MAINTENANCE_DELAY
+
+        while True:
+            with self._cond:
+                if self._is_running and not self._ops:
+                    wake = min(next_beat, next_watch, next_maintenance)
+                    if self._failed:
+                        wake = min(wake, self._retry_at)
+                    self._cond.wait(max(0.0, wake - time.monotonic()))
+                running = self._is_running
+
+            if running and any(kind == "write" for kind, _ in self._ops):
+                # Let results from other studios pile up before committing
+                time.sleep(BATCH_WINDOW)
+            self._flush()
+            self._retry_failed(force=not running)
+
+            if not running:
+                break
+
+            now = time.monotonic()
+            if self.lease is not None and now >= next_beat:
+                self.lease.renew()
+                next_beat = now + LEASE_HEARTBEAT
+            if now >= next_watch:
+                self._check_external_changes()
+                next_watch = now + WATCH_INTERVAL
+            if now >= next_maintenance and not self._ops and not self._failed:
+                if self.lease is None or self.lease.held:
+                    self.store.maintain(should_yield=self._has_work)
+                next_maintenance = time.monotonic() + MAINTENANCE_INTERVAL
+
+        if self.lease is not None:
+            self.lease.release()
+
+    def _has_work(self):
+        return bool(self._ops) or not self._is_running
+
+    def _flush(self):
+        with self._cond:
+            ops, self._ops = self._ops, []
+
+        batch = []
+        for kind, payload in ops + [(None, None)]:
+            if kind == "write":
+                batch.append(payload)
+                continue
+            # Commit consecutive writes together, other operations keep their place in between
+            if batch:
+                self._commit(batch)
+                batch = []
+            if kind == "clear":
+                studio_id, generation = payload
+                self._failed = [write for write in self._failed if write[0]["studio_id"] != studio_id]
+                self.store.clear_studio(studio_id)
+                self._written[studio_id] = generation
+                self._note_local_commit([studio_id])
+            elif kind == "load":
+                self._emit_records(payload)
+            elif kind == "search":
+                text, query = payload
+                self.search_finished.emit(text, self.store.search_jobs(query))
+
+    def _commit(self, batch):
+        if self._failed:
+            # Writes of a studio must land in order, so new ones queue behind a failed batch
+            self._failed.extend(batch)
+            return
+        if self.store.apply_changes([changes for changes, _ in batch]):
+            self._committed(batch)
+            return
+        self._failed = list(batch)
+        self._attempts = 1
+        self._retry_at = time.monotonic() + RETRY_DELAY
+
+    def _retry_failed(self, force=False):
+        """Retries the failed change sets once their backoff has passed (or now if `force`)."""
+        if not self._failed or (not force and time.monotonic() < self._retry_at):
+            return
+        batch, self._failed = self._failed, []
+        if self.store.apply_changes([changes for changes, _ in batch]):
+            self._attempts = 0
+            self._committed(batch)
+            return
+        if self._attempts >= WRITE_RETRIES or force:
+            logger.error(f"Dropped {len(batch)} studio results after {self._attempts + 1} failed commits.")
+            self._attempts = 0
+            # jobs.db is the reference again, so the next reads of these studios are applied
+            self._set_written(batch)
+            return
+        self._failed = batch
+        self._retry_at = time.monotonic() + RETRY_DELAY * 2**self._attempts
+        self._attempts += 1
+
+    def _committed(self, batch):
+        logger.info(f"Committed {len(batch)} studio results in one transaction.")
+        self._set_written(batch)
+        self._note_local_commit({changes["studio_id"] for changes, _ in batch})
+
+    def _set_written(self, batch):
+        for changes, generation in batch:
+            self._written[changes["studio_id"]] = generation
+
+    def _emit_records(self, studio_id):
+        self.jobs_changed.emit(studio_id, *self.store.studio_records(studio_id), self._written.get(studio_id, 0))
+
+    def _note_local_commit(self, studio_ids):
+        """Takes the signatures of studios this thread wrote, so polling only reports other processes' commits."""
+        signatures = self.store.studio_signatures(studio_ids)
+        for sid in studio_ids:
+            if sid in signatures:
+                self._signatures[sid] = signatures[sid]
+            else:
+                self._signatures.pop(sid, None)
+
+    def _check_external_changes(self):
+        version = self.store.data_version()
+        if version is None or version == self._db_version:
+            return
+        self._db_version = version
+
+        # Studios with writes still queued would be read without them and roll the index
+        # back; their rows are known once those writes are committed
+        with self._cond:
+            pending = {payload[0]["studio_id"] for kind, payload in self._ops if kind == "write"}
+        pending.update(changes["studio_id"] for changes, _ in self._failed)
+
+        signatures = self.store.studio_signatures()
+        changed = [
+            sid
+            for sid in set(signatures) | set(self._signatures)
+            if signatures.get(sid) != self._signatures.get(sid) and sid not in pending
+        ]
+        for sid in changed:
+            if sid in signatures:
+                self._signatures[sid] = signatures[sid]
+            else:
+                self._signatures.pop(sid, None)
+
+        for studio_id in changed:
+            self._emit_records(studio_id)
@@ -0,0 +1,175 @@
+import hashlib
+import time
+
+from .job_record import Job
+
+# Jobs not seen for this long are dropped from the history
+RETENTION_DAYS = 7
+
+# last_seen of a job that is still listed is only rewritten once it is older than
+# this. It just feeds the retention rule, so hourly precision is plenty and a
+# refresh that found nothing new writes nothing.
+LAST_SEEN_GRANULARITY = 3600
+
+# Kinds of job lifecycle events, see `JobIndex.sync` and the job_events table
+EVENT_APPEARED = 1
+EVENT_CHANGED = 2
+EVENT_DISAPPEARED = 3
+EVENT_REAPPEARED = 4
+
+
+def job_hash(job):
+    """
+    Deterministic identity of a job: the first 8 bytes of md5('link|title') as a
+    signed 64-bit integer, stored by SQLite as an 8-byte INTEGER.
+    """
+    raw_key = f"{job.get('link', '')}|{job.get('title', '')}"
+    return int.from_bytes(hashlib.md5(raw_key.encode("utf-8")).digest()[:8], "big", signed=True)
+
+
+def hex_to_job_hash(value):
+    """Converts a hex md5 job_hash of schema v1 to the integer form of `job_hash`."""
+    return int.from_bytes(bytes.fromhex(value[:16]), "big", signed=True)
+
+
+def diff_jobs(old_jobs, new_jobs):
+    """
+    Compares two job lists of a studio by `job_hash`. Returns {"added": [jobs],
+    "removed": [job_hash], "changed": [jobs]}; every list is empty if nothing changed.
+    """
+    old = {job.get("job_hash"): job for job in old_jobs}
+    new = {job.get("job_hash"): job for job in new_jobs}
+    return {
+        "added": [job for h, job in new.items() if h not in old],
+        "removed": [h for h in old if h not in new],
+        "changed": [job for h, job in new.items() if h in old and old[h] != job],
+    }
+
+
+class JobIndex:
+    """
+    In-memory copy of the job history, {studio_id: {job_hash: job}} plus when each
+    job was last seen and which jobs are gone from the site. A scrape is synced against it without touching the database;
+    `sync` returns the rows to write so persistence can happen later, elsewhere.
+
+    Studios may be held only partly (their newest jobs and a job count) until their
+    full history is needed, see `set_partial` and `is_loaded`.
+    """
+
+    def __init__(self, last_seen_granularity=LAST_SEEN_GRANULARITY):
+        self.last_seen_granularity = last_seen_granularity
+        self._jobs = {}  # {studio_id: {job_hash: job}}
+        self._last_seen = {}  # {studio_id: {job_hash: timestamp}}
+        self._gone = {}  # {studio_id: {job_hash}} of jobs no longer listed, kept until they expire
+        self._partial = {}  # {studio_id: (job count, last scrape)} of partly loaded studios
+
+    def set_studio(self, studio_id, jobs, last_seen, gone=()):
+        """Replaces a studio's jobs, e.g. with rows read from the database."""
+        self._jobs[studio_id] = {job["job_hash"]: job for job in jobs}
+        self._last_seen[studio_id] = dict(last_seen)
+        self._gone[studio_id] = set(gone)
+        self._partial.pop(studio_id, None)
+
+    def set_partial(self, studio_id, jobs, count, last_scrape):
+        """Holds only some of a studio's `count` jobs; it has to be `set_studio` before a `sync`."""
+        self._jobs[studio_id] = {job["job_hash"]: job for job in jobs}
+        self._last_seen[studio_id] = {}
+        self._gone[studio_id] = set()
+        self._partial[studio_id] = (count, last_scrape)
+
+    def is_loaded(self, studio_id):
+        return studio_id not in self._partial
+
+    def job_count(self, studio_id):
+        if studio_id in self._partial:
+            return self._partial[studio_id][0]
+        return len(self._jobs.get(studio_id, {}))
+
+    def drop_studio(self, studio_id):
+        self._jobs.pop(studio_id, None)
+        self._last_seen.pop(studio_id, None)
+        self._gone.pop(studio_id, None)
+        self._partial.pop(studio_id, None)
+
+    def studios(self):
+        return list(self._jobs)
+
+    def studio_jobs(self, studio_id):
+        """Returns a studio's jobs, newest first."""
+        jobs = list(self._jobs.get(studio_id, {}).values())
+        jobs.sort(key=lambda x: float(x.get("first_seen") or 0), reverse=True)
+        return jobs
+
+    def last_scrape_times(self):
+        """Returns {studio_id: latest last_seen}, accurate to LAST_SEEN_GRANULARITY."""
+        times = {sid: max(seen.values()) for sid, seen in self._last_seen.items() if seen}
+        times.update({sid: last_scrape for sid, (_, last_scrape) in self._partial.items() if last_scrape})
+        return times
+
+    def sync(self, studio_id, scraped, now=None):
+        """
+        Applies a scrape result. Returns (jobs newest first, changes) where `changes` holds
+        what has to be written to the database, see `JobStore.apply_changes`.
+
+        `changes["events"]` lists the lifecycle events of the scrape as (kind, job_hash).
+        An empty scrape is what a failed request looks like, so it never marks jobs as
+        disappeared.
+        """
+        if studio_id in self._partial:
+            raise ValueError(f"Cannot sync {studio_id}, only part of its jobs are loaded")
+        now = now or time.time()
+        jobs = self._jobs.setdefault(studio_id, {})
+        last_seen = self._last_seen.setdefault(studio_id, {})
+        gone = self._gone.setdefault(studio_id, set())
+        bump_threshold = now - self.last_seen_granularity
+        upserts = {}
+        bumps = []
+        events = []
+        listed = set()
+
+        for item in scraped:
+            h = job_hash(item)
+            if h in listed:
+                continue
+            listed.add(h)
+            content = (item.get("title", ""), item.get("link", ""), item.get("location", ""), item.get("extra_link", ""))
+            old = jobs.get(h)
+            edited = old is not None and content != (old["title"], old["link"], old["location"], old["extra_link"])
+            if old is None:
+                events.append((EVENT_APPEARED, h))
+            elif h in gone:
+                events.append((EVENT_REAPPEARED, h))
+            elif edited:
+                events.append((EVENT_CHANGED, h))
+
+            if old is None or edited or h in gone:
+                # New, edited or relisted job: keeps its original first_seen
+                first_seen = old["first_seen"] if old else now
+                jobs[h] = Job(*content, first_seen=first_seen, job_hash=h)
+                last_seen[h] = now
+                gone.discard(h)
+                upserts[h] = (h, studio_id) + content + (first_seen, now)
+            elif last_seen.get(h, 0) < bump_threshold:
+                last_seen[h] = now
+                bumps.append(h)
+
+        disappeared = [h for h in jobs if h not in listed and h not in gone] if listed else []
+        gone.update(disappeared)
+        events.extend((EVENT_DISAPPEARED, h) for h in disappeared)
+
+        # Jobs that vanished from the site stay around until the retention expires
+        expire_before = now - RETENTION_DAYS * 86400
+        for h in [h for h, seen in last_seen.items() if seen < expire_before]:
+            jobs.pop(h, None)
+            gone.discard(h)
+            del last_seen[h]
+
+        changes = {
+            "studio_id": studio_id,
+            "upserts": list(upserts.values()),
+            "bumps": bumps,
+            "disappeared": disappeared,
+            "events": events,
+            "now": now,
+        }
+        return self.studio_jobs(studio_id), changes
@@ -0,0 +1,96 @@
+import sys
+
+
+def _intern(value):
+    # Only str can be interned, None and other placeholders are kept as-is
+    return sys.intern(value) if type(value) is str else value
+
+
+class Job:
+    """
+    Compact job record used from the scraper to the UI in place of a dict.
+
+    Locations, extra links and the directory part of links repeat across most jobs
+    of a studio, so they are interned and shared. Qt passes these objects through
+    queued signals by reference, where dicts would be converted and copied.
+
+    Supports the dict-style access the rest of the code base uses
+    (`job["title"]`, `job.get("location", "")`).
+    """
+
+    __slots__ = ("job_hash", "title", "_link_prefix", "_link_tail", "location", "extra_link", "first_seen")
+
+    FIELDS = ("job_hash", "title", "link", "location", "extra_link", "first_seen")
+
+    def __init__(self, title="", link="", location="", extra_link="", first_seen=None, job_hash=None):
+        self.job_hash = job_hash
+        self.title = title
+        self.link = link
+        self.location = _intern(location)
+        self.extra_link = _intern(extra_link)
+        self.first_seen = first_seen
+
+    @property
+    def link(self):
+        if self._link_prefix is None:
+            return self._link_tail
+        return self._link_prefix + self._link_tail
+
+    @link.setter
+    def link(self, value):
+        if type(value) is str and "/" in value:
+            cut = value.rfind("/") + 1
+            self._link_prefix = sys.intern(value[:cut])
+            self._link_tail = value[cut:]
+        else:
+            self._link_prefix = None
+            self._link_tail = value
+
+    def __getitem__(self, key):
+        if key not in Job.FIELDS:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def __setitem__(self, key, value):
+        if key not in Job.FIELDS:
+            raise KeyError(key)
+        if key in ("location", "extra_link"):
+            value = _intern(value)
+        setattr(self, key, value)
+
+    def __contains__(self, key):
+        return key in Job.FIELDS
+
+    def get(self, key, default=None):
+        if key not in Job.FIELDS:
+            return default
+        return getattr(self, key)
+
+    def keys(self):
+        return Job.FIELDS
+
+    def items(self):
+        return [(key, getattr(self, key)) for key in Job.FIELDS]
+
+    def to_dict(self):
+        return dict(self.items())
+
+    def _values(self):
+        return (self.job_hash, self.title, self.link, self.location, self.extra_link, self.first_seen)
+
+    def __eq__(self, other):
+        if not isinstance(other, Job):
+            return NotImplemented
+        return self._values() == other._values()
+
+    __hash__ = None
+
+    def __getstate__(self):
+        return self._values()
+
+    def __setstate__(self, state):
+        job_hash, title, link, location, extra_link, first_seen = state
+        self.__init__(title, link, location, extra_link, first_seen, job_hash)
+
+    def __repr__(self):
+        return f"Job({self.title!r}, {self.link!r}, {self.location!r})"
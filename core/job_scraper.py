@@ -4,6 +4,7 @@ import urllib.parse
 import ssl
 import re
 from .logger import logger
+from .job_record import Job
 from .extractor import extract_json, extract_html, extract_items_html
 import urllib3
 
@@ -13,47 +14,64 @@ import json
 urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
 ssl._create_default_https_context = ssl._create_unverified_context
 
+STRATEGIES = ("json", "html", "json_text", "rss")
 
-class JobScraper:
-    def __init__(self):
-        self.session = requests.Session()
-        self.session.verify = False
-        self.session.headers.update(
-            {
-                "User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.114 Safari/537.36"
-            }
-        )
+# Order of the fields in the plain job tuples returned by `parse_jobs`
+JOB_FIELDS = ("title", "link", "location", "extra_link")
 
-    def fetch_jobs(self, studio):
-        """Main entry point for fetching jobs for a studio."""
-        scraping = studio.get("scraping", {})
-        strategy = scraping.get("strategy")
-        careers_urls = studio.get("careers_url")
+# Per-process parser used by `parse_jobs`
+_parser = None
 
-        if not isinstance(careers_urls, list):
-            careers_urls = [careers_urls]
+
+def parse_jobs(studio, payloads):
+    """
+    Parse stage entry point. Runs in a worker process, so it only takes and returns
+    plain picklable data: the studio config and the raw payloads from
+    `JobScraper.fetch_payloads`, and a list of (title, link, location, extra_link) tuples.
+    """
+    global _parser
+    if _parser is None:
+        _parser = JobParser()
+    return [tuple(job.get(f, "") for f in JOB_FIELDS) for job in _parser.parse_payloads(studio, payloads)]
+
+
+def jobs_from_tuples(rows):
+    return [Job(*row) for row in rows]
+
+
+def _decode(content, encoding):
+    """Decodes a payload body the same way `requests.Response.text` would."""
+    try:
+        return str(content, encoding or "utf-8", errors="replace")
+    except (LookupError, TypeError):
+        return str(content, "utf-8", errors="replace")
+
+
+class JobParser:
+    """Turns raw careers page payloads into Job records. Holds no network state."""
+
+    def parse_payloads(self, studio, payloads):
+        """Parses the (url, content, encoding) payloads of a studio and deduplicates the jobs."""
+        strategy = studio.get("scraping", {}).get("strategy")
 
         all_jobs = []
         seen_links = set()
 
-        for url in careers_urls:
-            if not url:
-                continue
-
+        for url, content, encoding in payloads:
             studio_for_url = studio.copy()
             studio_for_url["careers_url"] = url
 
             try:
+                text = _decode(content, encoding)
                 if strategy == "json":
-                    jobs = self.fetch_json(studio_for_url)
+                    jobs = self.parse_json(studio_for_url, text)
                 elif strategy == "html":
-                    jobs = self.fetch_html(studio_for_url)
+                    jobs = self.parse_html(studio_for_url, text)
                 elif strategy == "json_text":
-                    jobs = self.fetch_json_text(studio_for_url)
+                    jobs = self.parse_json_text(studio_for_url, text)
                 elif strategy == "rss":
-                    jobs = self.fetch_rss(studio_for_url)
+                    jobs = self.parse_rss(studio_for_url, text)
                 else:
-                    logger.warning(f"No valid strategy for {studio.get('id')}: {strategy}")
                     continue
             except Exception as e:
                 logger.error(f"Error fetching jobs from {url}: {e}")
@@ -80,30 +98,6 @@ class JobScraper:
 
         return all_jobs
 
-    def _handle_pre_visit(self, config):
-        """Visits a URL to set cookies and optionally extracts CSRF token."""
-        url = config.get("url")
-        if url:
-            try:
-                self.session.get(url)
-            except Exception as e:
-                logger.error(f"Pre-visit failed for {url}: {e}")
-
-        csrf = config.get("csrf")
-        if csrf:
-            cookie_name = csrf.get("cookie")
-            header_name = csrf.get("header")
-            if cookie_name and header_name:
-                cookie_val = self.session.cookies.get(cookie_name)
-                if cookie_val:
-                    if csrf.get("unescape"):
-                        cookie_val = urllib.parse.unquote(cookie_val)
-
-                    if csrf.get("split"):
-                        cookie_val = cookie_val.split(csrf["split"])[0]
-
-                    self.session.headers.update({header_name: cookie_val})
-
     def _apply_mapping_logic(self, val, m):
         """Centralized logic for split, regex, prefix, and suffix."""
         if not isinstance(m, dict):
@@ -168,7 +162,7 @@ class JobScraper:
             base = studio.get("website") or careers_url
             extra_link = urllib.parse.urljoin(base, str(extra_link))
 
-        return {"title": title, "link": link, "location": location, "extra_link": extra_link}
+        return Job(title, link, location, extra_link)
 
     def _remove_location_from_title(self, title, location):
         """Removes the location from the title and cleans up orphaned separators like ' - - '."""
@@ -206,35 +200,10 @@ class JobScraper:
         text = " ".join(text.split())
         return text.strip("·•| -:").strip()
 
-    def fetch_json(self, studio):
+    def parse_json(self, studio, text):
         careers_url = studio.get("careers_url")
         scraping = studio.get("scraping", {})
-
-        # Pre-visit logic
-        pre_visit = scraping.get("pre_visit")
-        if pre_visit:
-            self._handle_pre_visit(pre_visit)
-
-        # Request
-        method = scraping.get("method", "GET").upper()
-        params = scraping.get("params", {})
-        payload = scraping.get("payload")
-        headers = scraping.get("headers", {})
-
-        if method == "POST":
-            form_data = scraping.get("form_data")
-            response = self.session.post(
-                careers_url,
-                data=form_data if form_data else None,
-                json=payload if not form_data else None,
-                params=params,
-                headers={**self.session.headers, **headers},
-            )
-        else:
-            response = self.session.get(careers_url, params=params, headers=headers)
-
-        response.raise_for_status()
-        data = response.json()
+        data = json.loads(text)
 
         items = extract_json(data, scraping.get("path", ""), default=[])
         if not items:
@@ -283,18 +252,10 @@ class JobScraper:
 
         return jobs
 
-    def fetch_json_text(self, studio):
+    def parse_json_text(self, studio, text):
         careers_url = studio.get("careers_url")
         scraping = studio.get("scraping", {})
-
-        method = scraping.get("method", "GET").upper()
-        params, payload, headers = scraping.get("params", {}), scraping.get("payload"), scraping.get("headers", {})
-
-        if method == "POST":
-            response = self.session.post(careers_url, json=payload, params=params, headers=headers)
-        else:
-            response = self.session.get(careers_url, params=params, headers=headers)
-        response.raise_for_status()
+        page = text
 
         jt_cfg = scraping.get("json_text", {})
         json_regex = jt_cfg.get("regex")
@@ -313,7 +274,7 @@ class JobScraper:
             regex = r"(?:const|var|let|window\.)\s*jobsData\s*=\s*(\[.*?\])\s*(?:;|\n|<\/script>)"
 
         # Use re.DOTALL to match across lines
-        soup = BeautifulSoup(response.text, "html.parser")
+        soup = BeautifulSoup(page, "html.parser")
         text = ""
 
         # 1. Search in scripts matching container or all script tags
@@ -326,8 +287,8 @@ class JobScraper:
 
         # 2. Fallback: Search all HTML if not found in scripts
         if not text:
-            if re.search(regex, response.text, re.DOTALL):
-                text = response.text
+            if re.search(regex, page, re.DOTALL):
+                text = page
 
         if not text:
             logger.error(f"Could not find JSON text matching {regex}")
@@ -352,37 +313,18 @@ class JobScraper:
             logger.error(f"Error parsing JSON: {e}")
             return []
 
-    def fetch_html(self, studio):
+    def parse_html(self, studio, text):
         careers_url = studio.get("careers_url")
         scraping = studio.get("scraping", {})
         mapping = scraping.get("map", {})
 
-        method = scraping.get("method", "GET").upper()
-        params, payload, headers = (
-            scraping.get("params", {}),
-            scraping.get("payload"),
-            scraping.get("headers", {}),
-        )
-        form_data = scraping.get("form_data")
-
-        if method == "POST":
-            # Support both JSON payload and form_data
-            if form_data:
-                response = self.session.post(careers_url, data=form_data, params=params, headers=headers)
-            else:
-                response = self.session.post(careers_url, json=payload, params=params, headers=headers)
-        else:
-            response = self.session.get(careers_url, params=params, headers=headers)
-
-        response.raise_for_status()
-
         # Handle JSON response with HTML field (e.g. Hireify)
-        html_content = response.text
+        html_content = text
         json_html_field = scraping.get("json_html_field")
         if json_html_field:
             try:
-                data = response.json()
-                html_content = extract_json(data, json_html_field, response.text)
+                data = json.loads(text)
+                html_content = extract_json(data, json_html_field, text)
             except Exception:
                 pass
 
@@ -495,22 +437,13 @@ class JobScraper:
 
         return jobs
 
-    def fetch_rss(self, studio):
+    def parse_rss(self, studio, text):
         rss_url = studio.get("careers_url") or studio.get("website")
         scraping = studio.get("scraping", {})
         mapping = scraping.get("map", {})
 
-        method = scraping.get("method", "GET").upper()
-        params, payload, headers = scraping.get("params", {}), scraping.get("payload"), scraping.get("headers", {})
-
-        if method == "POST":
-            response = self.session.post(rss_url, json=payload, params=params, headers=headers)
-        else:
-            response = self.session.get(rss_url, params=params, headers=headers)
-        response.raise_for_status()
-
         # Always use html.parser to avoid requiring the 'lxml' or 'xml' feature of BS4
-        soup = BeautifulSoup(response.text, "html.parser")
+        soup = BeautifulSoup(text, "html.parser")
 
         items = soup.select(scraping.get("container") or "item") or soup.find_all(["item", "entry"])
         jobs = []
@@ -568,3 +501,124 @@ class JobScraper:
                 jobs.append(job)
 
         return jobs
+
+
+class JobScraper(JobParser):
+    """Fetch stage: performs the HTTP requests for a studio. Parsing is inherited from JobParser."""
+
+    def __init__(self):
+        self.session = requests.Session()
+        self.session.verify = False
+        self.session.headers.update(
+            {
+                "User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.114 Safari/537.36"
+            }
+        )
+
+    def fetch_jobs(self, studio):
+        """Main entry point for fetching jobs for a studio (fetch and parse in the calling thread)."""
+        return self.parse_payloads(studio, self.fetch_payloads(studio))
+
+    def fetch_payloads(self, studio):
+        """
+        Network half of `fetch_jobs`. Returns a list of (url, content, encoding) tuples,
+        one per careers URL that responded, ready to be handed to `parse_jobs`.
+        """
+        strategy = studio.get("scraping", {}).get("strategy")
+        if strategy not in STRATEGIES:
+            logger.warning(f"No valid strategy for {studio.get('id')}: {strategy}")
+            return []
+
+        careers_urls = studio.get("careers_url")
+        if not isinstance(careers_urls, list):
+            careers_urls = [careers_urls]
+
+        payloads = []
+        for url in careers_urls:
+            if not url:
+                continue
+
+            studio_for_url = studio.copy()
+            studio_for_url["careers_url"] = url
+
+            try:
+                response = self._request(studio_for_url)
+                response.raise_for_status()
+            except Exception as e:
+                logger.error(f"Error fetching jobs from {url}: {e}")
+                continue
+
+            payloads.append((url, response.content, response.encoding))
+
+        return payloads
+
+    def _request(self, studio):
+        """Issues the request described by the studio's scraping config."""
+        scraping = studio.get("scraping", {})
+        strategy = scraping.get("strategy")
+        url = studio.get("careers_url")
+        if strategy == "rss":
+            url = url or studio.get("website")
+
+        method = scraping.get("method", "GET").upper()
+        params, payload, headers = scraping.get("params", {}), scraping.get("payload"), scraping.get("headers", {})
+        form_data = scraping.get("form_data")
+
+        if strategy == "json":
+            # Pre-visit logic
+            pre_visit = scraping.get("pre_visit")
+            if pre_visit:
+                self._handle_pre_visit(pre_visit)
+
+            if method == "POST":
+                return self.session.post(
+                    url,
+                    data=form_data if form_data else None,
+                    json=payload if not form_data else None,
+                    params=params,
+                    headers={**self.session.headers, **headers},
+                )
+            return self.session.get(url, params=params, headers=headers)
+
+        if method == "POST":
+            # Support both JSON payload and form_data (HTML strategy only)
+            if strategy == "html" and form_data:
+                return self.session.post(url, data=form_data, params=params, headers=headers)
+            return self.session.post(url, json=payload, params=params, headers=headers)
+        return self.session.get(url, params=params, headers=headers)
+
+    def _handle_pre_visit(self, config):
+        """Visits a URL to set cookies and optionally extracts CSRF token."""
+        url = config.get("url")
+        if url:
+            try:
+                self.session.get(url)
+            except Exception as e:
+                logger.error(f"Pre-visit failed for {url}: {e}")
+
+        csrf = config.get("csrf")
+        if csrf:
+            cookie_name = csrf.get("cookie")
+            header_name = csrf.get("header")
+            if cookie_name and header_name:
+                cookie_val = self.session.cookies.get(cookie_name)
+                if cookie_val:
+                    if csrf.get("unescape"):
+                        cookie_val = urllib.parse.unquote(cookie_val)
+
+                    if csrf.get("split"):
+                        cookie_val = cookie_val.split(csrf["split"])[0]
+
+                    self.session.headers.update({header_name: cookie_val})
+
+
+# Outlives the windows using it, so reopening JobUI without a reload keeps its connections
+_shared_scraper = None
+
+
+def shared_scraper():
+    """The JobScraper of this process, created on first use."""
+    global _shared_scraper
+    if _shared_scraper is None:
+        _shared_scraper = JobScraper()
+    return _shared_scraper
@@ -0,0 +1,927 @@
+import os
+import re
+import sqlite3
+import threading
+import time
+
+from .logger import logger
+from .job_index import EVENT_APPEARED, JobIndex, LAST_SEEN_GRANULARITY, RETENTION_DAYS, hex_to_job_hash
+from .job_record import Job
+
+# Stays below SQLite's default host parameter limit (999 before 3.32)
+SQL_VARIABLE_CHUNK = 500
+
+# Applied once to every connection. NORMAL is durable under WAL except for the
+# last transactions before a power loss, which a rescrape recovers anyway.
+CONNECTION_PRAGMAS = (
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA mmap_size=67108864",  # 64 MB
+    "PRAGMA cache_size=-16000",  # 16 MB
+)
+
+# Prepared statements kept per connection (sqlite3 caches them by SQL text)
+STATEMENT_CACHE_SIZE = 128
+
+# Housekeeping, see `JobStore.maintain`: expired rows deleted per transaction and
+# free pages handed back to the file system per incremental vacuum
+RETENTION_BATCH = 500
+VACUUM_PAGES = 256
+AUTO_VACUUM_INCREMENTAL = 2
+
+# Bumped whenever `init_schema` has to migrate existing files (PRAGMA user_version)
+SCHEMA_VERSION = 3
+
+# Clustered by studio and newest first, which is how every read walks it, so
+# studio reads are range scans of the table itself. job_hash is the 64-bit
+# integer from job_index.job_hash.
+CREATE_JOBS_TABLE = """
+    CREATE TABLE IF NOT EXISTS {name} (
+        job_hash INTEGER NOT NULL,
+        studio_id TEXT NOT NULL,
+        title TEXT,
+        link TEXT,
+        location TEXT,
+        extra_link TEXT,
+        first_seen REAL NOT NULL,
+        last_seen REAL NOT NULL,
+        active INTEGER NOT NULL DEFAULT 1,
+        PRIMARY KEY (studio_id, first_seen DESC, job_hash)
+    ) WITHOUT ROWID
+"""
+
+# Full-text index over titles and locations. rowid is the job's job_hash and the
+# triggers below keep it in step with every write to jobs (syncs, retention, clears).
+# Contentless: the text already lives in jobs, so removing a row from the index
+# takes the 'delete' command with the values it was indexed with.
+CREATE_JOBS_FTS = """
+    CREATE VIRTUAL TABLE jobs_fts USING fts5(
+        title, location, content = '', tokenize = 'unicode61 remove_diacritics 2'
+    )
+"""
+
+JOBS_FTS_TRIGGERS = (
+    """
+    CREATE TRIGGER IF NOT EXISTS jobs_fts_insert AFTER INSERT ON jobs BEGIN
+        INSERT INTO jobs_fts (rowid, title, location) VALUES (new.job_hash, new.title, new.location);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS jobs_fts_delete AFTER DELETE ON jobs BEGIN
+        INSERT INTO jobs_fts (jobs_fts, rowid, title, location) VALUES ('delete', old.job_hash, old.title, old.location);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS jobs_fts_update AFTER UPDATE OF title, location ON jobs BEGIN
+        INSERT INTO jobs_fts (jobs_fts, rowid, title, location) VALUES ('delete', old.job_hash, old.title, old.location);
+        INSERT INTO jobs_fts (rowid, title, location) VALUES (new.job_hash, new.title, new.location);
+    END
+    """,
+)
+
+# Every listed, unexpired match is returned since cards hide the jobs missing from it.
+# The studio comes from idx_jobs_hash.
+SEARCH_JOBS = """
+    SELECT j.studio_id, f.rowid AS job_hash
+    FROM jobs_fts AS f
+    JOIN jobs AS j ON j.job_hash = f.rowid
+    WHERE jobs_fts MATCH ? AND j.active = 1 AND j.last_seen >= ?
+"""
+
+# Title hits weigh more than location hits. bm25 scores every match, about 20 ms per
+# 10k hits, so broad terms with more than SEARCH_RANK_LIMIT hits keep the newest-first order.
+RANK_JOBS = """
+    SELECT rowid AS job_hash
+    FROM jobs_fts
+    WHERE jobs_fts MATCH ?
+    ORDER BY bm25(jobs_fts, 10.0, 1.0)
+"""
+SEARCH_RANK_LIMIT = 2000
+
+# Append-only job lifecycle log (kinds in job_index). Timestamps are whole seconds
+# and studios are small integer keys from `studios`, so a row is a few bytes and
+# is never touched by retention. An index covers the "since" queries, and a trigger
+# keeps per-week counts so weekly statistics don't group the whole log.
+CREATE_STUDIOS_TABLE = """
+    CREATE TABLE IF NOT EXISTS studios (
+        studio_key INTEGER PRIMARY KEY,
+        studio_id TEXT NOT NULL UNIQUE
+    )
+"""
+
+CREATE_JOB_EVENTS_TABLE = """
+    CREATE TABLE job_events (
+        ts INTEGER NOT NULL,
+        studio_key INTEGER NOT NULL,
+        kind INTEGER NOT NULL,
+        job_hash INTEGER NOT NULL
+    )
+"""
+
+SELECT_NEW_JOBS = """
+    SELECT s.studio_id, j.job_hash, j.title, j.link, j.location, j.extra_link, j.first_seen
+    FROM job_events AS e
+    JOIN studios AS s ON s.studio_key = e.studio_key
+    JOIN jobs AS j ON j.job_hash = e.job_hash
+    WHERE e.kind = ? AND e.ts >= ?
+    ORDER BY e.ts DESC
+"""
+
+# Weeks start on Monday 00:00 UTC; the epoch itself was a Thursday
+WEEK = 7 * 86400
+WEEK_OFFSET = 4 * 86400
+
+CREATE_JOB_EVENT_WEEKS_TABLE = """
+    CREATE TABLE job_event_weeks (
+        kind INTEGER NOT NULL,
+        week INTEGER NOT NULL,
+        studio_key INTEGER NOT NULL,
+        n INTEGER NOT NULL,
+        PRIMARY KEY (kind, week, studio_key)
+    ) WITHOUT ROWID
+"""
+
+JOB_EVENT_WEEKS_TRIGGER = f"""
+    CREATE TRIGGER IF NOT EXISTS job_events_weekly AFTER INSERT ON job_events BEGIN
+        INSERT INTO job_event_weeks (kind, week, studio_key, n)
+        VALUES (new.kind, (new.ts - {WEEK_OFFSET}) / {WEEK}, new.studio_key, 1)
+        ON CONFLICT (kind, week, studio_key) DO UPDATE SET n = n + 1;
+    END
+"""
+
+SELECT_WEEKLY_EVENTS = f"""
+    SELECT s.studio_id, w.week * {WEEK} + {WEEK_OFFSET} AS week_start, w.n
+    FROM job_event_weeks AS w
+    JOIN studios AS s ON s.studio_key = w.studio_key
+    WHERE w.kind = ? AND w.week >= ?
+"""
+
+# Long-term archive (jobs_archive.db next to jobs.db), attached only by the threads
+# that archive or query it. Expired jobs are moved there by `maintain` instead of
+# being deleted. Studios, locations and the directory part of links repeat across
+# most rows, so they are stored once in dictionary tables and referenced by key;
+# timestamps are whole seconds.
+ARCHIVE_SCHEMA = (
+    "CREATE TABLE IF NOT EXISTS archive.studios (studio_key INTEGER PRIMARY KEY, studio_id TEXT NOT NULL UNIQUE)",
+    "CREATE TABLE IF NOT EXISTS archive.locations (location_key INTEGER PRIMARY KEY, location TEXT NOT NULL UNIQUE)",
+    "CREATE TABLE IF NOT EXISTS archive.link_prefixes (prefix_key INTEGER PRIMARY KEY, prefix TEXT NOT NULL UNIQUE)",
+    """
+    CREATE TABLE IF NOT EXISTS archive.jobs (
+        studio_key INTEGER NOT NULL,
+        first_seen INTEGER NOT NULL,
+        job_hash INTEGER NOT NULL,
+        last_seen INTEGER NOT NULL,
+        title TEXT,
+        link_prefix_key INTEGER,
+        link_tail TEXT,
+        location_key INTEGER,
+        extra_link_prefix_key INTEGER,
+        extra_link_tail TEXT,
+        PRIMARY KEY (studio_key, first_seen, job_hash)
+    ) WITHOUT ROWID
+    """,
+    """
+    CREATE VIEW IF NOT EXISTS archive.archived_jobs AS
+    SELECT s.studio_id, j.job_hash, j.title,
+        COALESCE(lp.prefix, '') || COALESCE(j.link_tail, '') AS link,
+        COALESCE(l.location, '') AS location,
+        COALESCE(ep.prefix, '') || COALESCE(j.extra_link_tail, '') AS extra_link,
+        j.first_seen, j.last_seen
+    FROM jobs AS j
+    JOIN studios AS s ON s.studio_key = j.studio_key
+    LEFT JOIN link_prefixes AS lp ON lp.prefix_key = j.link_prefix_key
+    LEFT JOIN locations AS l ON l.location_key = j.location_key
+    LEFT JOIN link_prefixes AS ep ON ep.prefix_key = j.extra_link_prefix_key
+    """,
+)
+
+SELECT_ARCHIVED_JOBS = """
+    SELECT studio_id, job_hash, title, link, location, extra_link, first_seen, last_seen
+    FROM archive.archived_jobs
+    WHERE studio_id = ? AND first_seen >= ?
+    ORDER BY first_seen DESC
+"""
+
+
+def archive_path(db_path):
+    """config/jobs.db -> config/jobs_archive.db"""
+    root, ext = os.path.splitext(db_path)
+    return f"{root}_archive{ext or '.db'}"
+
+
+def split_link(link):
+    """Splits a link after its last '/' into (directory prefix, tail), like `Job.link`."""
+    if not link or "/" not in link:
+        return None, link
+    cut = link.rfind("/") + 1
+    return link[:cut], link[cut:]
+
+
+# Search text containing any of these is matched as a regular expression
+REGEX_CHARS = frozenset(".^$*+?{}[]\\|()")
+
+SELECT_STUDIO_JOBS = """
+    SELECT job_hash, title, link, location, extra_link, first_seen
+    FROM jobs
+    WHERE studio_id = ?
+    ORDER BY first_seen DESC
+"""
+
+# The summary only reads idx_jobs_studio_seen and the recent jobs stop after `limit`
+# rows of the table, so startup cost does not grow with the history size
+SELECT_STUDIO_SUMMARY = """
+    SELECT studio_id, COUNT(*) AS n, MAX(last_seen) AS last_seen
+    FROM jobs
+    WHERE last_seen >= ?
+    GROUP BY studio_id
+"""
+
+SELECT_RECENT_JOBS = """
+    SELECT job_hash, title, link, location, extra_link, first_seen, last_seen, active
+    FROM jobs
+    WHERE studio_id = ? AND last_seen >= ?
+    ORDER BY first_seen DESC
+    LIMIT ?
+"""
+
+
+def fts_query(text):
+    """
+    Turns plain search text into an FTS5 query matching every word as a prefix.
+    Returns None for regular expressions and text without words, which are matched
+    with `re` instead.
+    """
+    if any(c in REGEX_CHARS for c in text):
+        return None
+    words = re.findall(r"\w+", text)
+    if not words:
+        return None
+    return " ".join(f'"{word}"*' for word in words)
+
+
+class ConnectionManager:
+    """
+    One long-lived connection per thread, so the schema is parsed and the pragma
+    profile applied once instead of on every query, and statements stay prepared.
+    """
+
+    def __init__(self, db_path):
+        self.db_path = db_path
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._connections = []
+
+    def get(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            # Connections never leave their thread; close_all may run from another one
+            conn = sqlite3.connect(self.db_path, check_same_thread=False, cached_statements=STATEMENT_CACHE_SIZE)
+            conn.row_factory = sqlite3.Row
+            for pragma in CONNECTION_PRAGMAS:
+                conn.execute(pragma)
+            self._local.conn = conn
+            with self._lock:
+                self._connections.append(conn)
+        return conn
+
+    def close_all(self):
+        with self._lock:
+            connections, self._connections = self._connections, []
+        for conn in connections:
+            try:
+                conn.close()
+            except sqlite3.Error:
+                pass
+        self._local = threading.local()
+
+
+class JobStore:
+    """
+    SQLite persistence for scraped jobs (config/jobs.db). Has no Qt dependency so
+    it can be shared by the UI's ConfigManager and the headless daemon.
+    """
+
+    def __init__(self, db_path, last_seen_granularity=LAST_SEEN_GRANULARITY):
+        self.db_path = db_path
+        self.archive_path = archive_path(db_path)
+        self.last_seen_granularity = last_seen_granularity
+        self.connections = ConnectionManager(db_path)
+        self.has_fts = False  # Set by init_schema if SQLite was built with FTS5
+        self.init_schema()
+
+    def connect(self):
+        """Returns this thread's database connection."""
+        return self.connections.get()
+
+    def close(self):
+        self.connections.close_all()
+
+    def init_schema(self):
+        """Initializes the database schema, migrating older files to SCHEMA_VERSION."""
+        try:
+            with self.connect() as conn:
+                # Only takes effect on a new database, older ones are converted by `maintain`
+                conn.execute("PRAGMA auto_vacuum=INCREMENTAL")
+
+                # Enable WAL mode for better concurrency
+                conn.execute("PRAGMA journal_mode=WAL;")
+
+                version = conn.execute("PRAGMA user_version").fetchone()[0]
+                has_jobs = conn.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'jobs'").fetchone()
+                if has_jobs and version < 2:
+                    self._migrate_jobs_table(conn)
+                elif has_jobs and version < 3:
+                    logger.info("Migrating DB: Adding active column to 'jobs' table.")
+                    conn.execute("ALTER TABLE jobs ADD COLUMN active INTEGER NOT NULL DEFAULT 1")
+                    conn.execute("DROP INDEX IF EXISTS idx_jobs_studio_seen")
+
+                conn.execute(CREATE_JOBS_TABLE.format(name="jobs"))
+                # Upserts and last_seen bumps look jobs up by hash alone
+                conn.execute("CREATE UNIQUE INDEX IF NOT EXISTS idx_jobs_hash ON jobs (job_hash)")
+                # Covers the per-studio counts, scrape times, signatures and retention
+                conn.execute("CREATE INDEX IF NOT EXISTS idx_jobs_studio_seen ON jobs (studio_id, last_seen, active)")
+                self.has_fts = self._init_fts(conn)
+                self._init_job_events(conn)
+
+                # Scrape leadership between processes sharing this database (see scrape_lease)
+                conn.execute("""
+                    CREATE TABLE IF NOT EXISTS leases (
+                        name TEXT PRIMARY KEY,
+                        owner TEXT,
+                        priority INTEGER,
+                        expires REAL
+                    )
+                """)
+                conn.execute(f"PRAGMA user_version={SCHEMA_VERSION}")
+                conn.commit()
+        except sqlite3.Error as e:
+            logger.error(f"Database initialization failed: {e}")
+
+    def _init_fts(self, conn):
+        """Creates and fills the full-text index if missing. Returns False without FTS5 support."""
+        if not conn.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'jobs_fts'").fetchone():
+            try:
+                conn.execute(CREATE_JOBS_FTS)
+            except sqlite3.OperationalError as e:
+                logger.info(f"Full-text search unavailable, searching with regular expressions only: {e}")
+                return False
+            conn.execute("INSERT INTO jobs_fts (rowid, title, location) SELECT job_hash, title, location FROM jobs")
+        for trigger in JOBS_FTS_TRIGGERS:
+            conn.execute(trigger)
+        return True
+
+    def _init_job_events(self, conn):
+        """Creates the job lifecycle log, seeded with an 'appeared' event for every stored job."""
+        conn.execute(CREATE_STUDIOS_TABLE)
+        if conn.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'job_events'").fetchone():
+            return
+        conn.execute(CREATE_JOB_EVENTS_TABLE)
+        conn.execute("CREATE INDEX idx_job_events_kind_ts ON job_events (kind, ts, studio_key, job_hash)")
+        conn.execute(CREATE_JOB_EVENT_WEEKS_TABLE)
+        conn.execute(JOB_EVENT_WEEKS_TRIGGER)
+        conn.execute("INSERT OR IGNORE INTO studios (studio_id) SELECT DISTINCT studio_id FROM jobs")
+        conn.execute(
+            """
+            INSERT INTO job_events (ts, studio_key, kind, job_hash)
+            SELECT CAST(j.first_seen AS INTEGER), s.studio_key, ?, j.job_hash
+            FROM jobs AS j JOIN studios AS s ON s.studio_id = j.studio_id
+            ORDER BY j.first_seen
+        """,
+            (EVENT_APPEARED,),
+        )
+
+    def _migrate_jobs_table(self, conn):
+        """Copies a version 0/1 jobs table (hex TEXT hash, rowid table) into the current layout."""
+        # Migration: Add new columns if they don't exist
+        columns = [row["name"] for row in conn.execute("PRAGMA table_info(jobs)").fetchall()]
+
+        needed_columns = {"title": "TEXT", "link": "TEXT", "location": "TEXT", "extra_link": "TEXT"}
+
+        for col, col_type in needed_columns.items():
+            if col not in columns:
+                logger.info(f"Migrating DB: Adding {col} column to 'jobs' table.")
+                conn.execute(f"ALTER TABLE jobs ADD COLUMN {col} {col_type}")
+
+        rows = conn.execute(
+            "SELECT job_hash, studio_id, title, link, location, extra_link, first_seen, last_seen FROM jobs"
+        ).fetchall()
+        logger.info(f"Migrating DB: Rebuilding 'jobs' table ({len(rows)} rows) for schema v{SCHEMA_VERSION}.")
+
+        conn.execute(CREATE_JOBS_TABLE.format(name="jobs_migrated"))
+        conn.executemany(
+            "INSERT OR IGNORE INTO jobs_migrated "
+            "(job_hash, studio_id, title, link, location, extra_link, first_seen, last_seen) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            [
+                (
+                    hex_to_job_hash(row["job_hash"]),
+                    row["studio_id"] or "",
+                    row["title"],
+                    row["link"],
+                    row["location"],
+                    row["extra_link"],
+                    row["first_seen"] or row["last_seen"] or 0,
+                    row["last_seen"] or 0,
+                )
+                for row in rows
+            ],
+        )
+        conn.execute("DROP TABLE jobs")
+        conn.execute("ALTER TABLE jobs_migrated RENAME TO jobs")
+
+    @staticmethod
+    def _row_to_job(row):
+        return Job(
+            row["title"] or "",
+            row["link"] or "",
+            row["location"] or "",
+            row["extra_link"] or "",
+            row["first_seen"],
+            row["job_hash"],
+        )
+
+    @staticmethod
+    def _expire_before():
+        # Expired rows are deleted in the background by `maintain`; until then reads skip them
+        return time.time() - RETENTION_DAYS * 86400
+
+    def load_index(self):
+        """Loads every job that has not expired into a new JobIndex."""
+        index = JobIndex(self.last_seen_granularity)
+        try:
+            with self.connect() as conn:
+                cursor = conn.cursor()
+                cursor.execute(
+                    """
+                    SELECT studio_id, job_hash, title, link, location, extra_link, first_seen, last_seen, active
+                    FROM jobs
+                    WHERE last_seen >= ?
+                """,
+                    (self._expire_before(),),
+                )
+                rows = cursor.fetchall()
+
+                jobs_by_studio = {}
+                for row in rows:
+                    jobs, last_seen, gone = jobs_by_studio.setdefault(row["studio_id"], ([], {}, []))
+                    jobs.append(self._row_to_job(row))
+                    last_seen[row["job_hash"]] = row["last_seen"] or 0
+                    if not row["active"]:
+                        gone.append(row["job_hash"])
+                for studio_id, (jobs, last_seen, gone) in jobs_by_studio.items():
+                    index.set_studio(studio_id, jobs, last_seen, gone)
+                logger.info(f"Loaded {len(rows)} jobs from database cache.")
+        except sqlite3.Error as e:
+            logger.error(f"Failed to load jobs from DB: {e}")
+        return index
+
+    def load_recent_index(self, studio_ids, limit):
+        """
+        Startup load: the job count of every studio and the `limit` newest jobs of
+        `studio_ids`. Studios with more jobs than that are only partly loaded into the
+        returned JobIndex, their full history is read with `studio_records` when needed.
+        """
+        index = JobIndex(self.last_seen_granularity)
+        expire_before = self._expire_before()
+        try:
+            with self.connect() as conn:
+                cursor = conn.cursor()
+                cursor.execute(SELECT_STUDIO_SUMMARY, (expire_before,))
+                summary = [(row["studio_id"], row["n"], row["last_seen"]) for row in cursor.fetchall()]
+
+                loaded = 0
+                for studio_id, count, last_scrape in summary:
+                    rows = []
+                    if studio_id in studio_ids:
+                        cursor.execute(SELECT_RECENT_JOBS, (studio_id, expire_before, limit))
+                        rows = cursor.fetchall()
+                    jobs = [self._row_to_job(row) for row in rows]
+                    loaded += len(jobs)
+                    if len(rows) == count:
+                        index.set_studio(studio_id, *self._rows_to_records(rows))
+                    else:
+                        index.set_partial(studio_id, jobs, count, last_scrape)
+                logger.info(f"Loaded {loaded} of {sum(s[1] for s in summary)} jobs from database cache.")
+        except sqlite3.Error as e:
+            logger.error(f"Failed to load jobs from DB: {e}")
+        return index
+
+    def load_jobs(self):
+        """Returns {studio_id: [jobs]} for every stored job, newest first."""
+        index = self.load_index()
+        return {sid: index.studio_jobs(sid) for sid in index.studios()}
+
+    def last_scrape_times(self):
+        """Returns {studio_id: last successful scrape timestamp} derived from job history."""
+        try:
+            with self.connect() as conn:
+                cursor = conn.cursor()
+                cursor.execute("SELECT studio_id, MAX(last_seen) AS last_seen FROM jobs GROUP BY studio_id")
+                return {row["studio_id"]: row["last_seen"] for row in cursor.fetchall() if row["last_seen"]}
+        except sqlite3.Error as e:
+            logger.error(f"Failed to fetch scrape times: {e}")
+            return {}
+
+    def studio_signatures(self, studio_ids=None):
+        """
+        Returns {studio_id: (latest last_seen, job count, listed job count)}, used to spot
+        studios changed by other processes. Limited to `studio_ids` if given.
+        """
+        where, params = "", ()
+        if studio_ids is not None:
+            params = tuple(studio_ids)
+            where = f"WHERE studio_id IN ({', '.join('?' * len(params))}) "
+        try:
+            with self.connect() as conn:
+                cursor = conn.cursor()
+                cursor.execute(
+                    "SELECT studio_id, MAX(last_seen) AS last_seen, COUNT(*) AS n, SUM(active) AS listed "
+                    f"FROM jobs {where}GROUP BY studio_id",
+                    params,
+                )
+                return {row["studio_id"]: (row["last_seen"], row["n"], row["listed"]) for row in cursor.fetchall()}
+        except sqlite3.Error as e:
+            logger.error(f"Failed to fetch studio signatures: {e}")
+            return {}
+
+    def studio_jobs(self, studio_id):
+        """Returns the stored jobs of one studio, newest first."""
+        try:
+            with self.connect() as conn:
+                cursor = conn.cursor()
+                cursor.execute(SELECT_STUDIO_JOBS, (studio_id,))
+                return [self._row_to_job(row) for row in cursor.fetchall()]
+        except sqlite3.Error as e:
+            logger.error(f"Failed to load jobs for {studio_id}: {e}")
+            return []
+
+    def studio_records(self, studio_id):
+        """
+        Returns (jobs newest first, {job_hash: last_seen}, [job_hash of jobs gone from
+        the site]) of one studio, as needed by `JobIndex.set_studio`.
+        """
+        try:
+            with self.connect() as conn:
+                return self._studio_records(conn.cursor(), studio_id)
+        except sqlite3.Error as e:
+            logger.error(f"Failed to load jobs for {studio_id}: {e}")
+            return [], {}, []
+
+    def _studio_records(self, cursor, studio_id):
+        cursor.execute(
+            """
+            SELECT job_hash, title, link, location, extra_link, first_seen, last_seen, active
+            FROM jobs
+            WHERE studio_id = ? AND last_seen >= ?
+            ORDER BY first_seen DESC
+        """,
+            (studio_id, self._expire_before()),
+        )
+        return self._rows_to_records(cursor.fetchall())
+
+    def _rows_to_records(self, rows):
+        return (
+            [self._row_to_job(row) for row in rows],
+            {row["job_hash"]: row["last_seen"] or 0 for row in rows},
+            [row["job_hash"] for row in rows if not row["active"]],
+        )
+
+    def new_jobs_since(self, timestamp):
+        """
+        Returns {studio_id: [jobs, newest first]} of the jobs that appeared since
+        `timestamp` and are still stored, e.g. everything new since the last session.
+        """
+        new_jobs = {}
+        try:
+            cursor = self.connect().execute(SELECT_NEW_JOBS, (EVENT_APPEARED, int(timestamp)))
+            for row in cursor.fetchall():
+                new_jobs.setdefault(row["studio_id"], []).append(self._row_to_job(row))
+        except sqlite3.Error as e:
+            logger.error(f"Failed to read new jobs: {e}")
+        return new_jobs
+
+    def weekly_event_counts(self, since=0, kind=EVENT_APPEARED):
+        """
+        Returns {studio_id: {week start timestamp: count}} of the `kind` events since
+        `since`, by default the postings per studio per week, counting from the start
+        of the week `since` falls in. Jobs deleted by the retention still count.
+        """
+        counts = {}
+        try:
+            cursor = self.connect().execute(SELECT_WEEKLY_EVENTS, (kind, (int(since) - WEEK_OFFSET) // WEEK))
+            for row in cursor.fetchall():
+                counts.setdefault(row["studio_id"], {})[row["week_start"]] = row["n"]
+        except sqlite3.Error as e:
+            logger.error(f"Failed to read job events: {e}")
+        return counts
+
+    def search_jobs(self, query):
+        """
+        Runs an FTS5 query (see `fts_query`) and returns {studio_id: {job_hash: rank}} of
+        every listed job that matches, rank 0 being the best match across all studios. Past
+        SEARCH_RANK_LIMIT matches all ranks are 0.
+        """
+        matches = {}
+        try:
+            conn = self.connect()
+            rows = conn.execute(SEARCH_JOBS, (query, self._expire_before())).fetchall()
+            studio_of = {row["job_hash"]: row["studio_id"] for row in rows}
+            ranked = conn.execute(RANK_JOBS, (query,)) if len(rows) <= SEARCH_RANK_LIMIT else ()
+            rank = 0
+            for row in ranked:
+                sid = studio_of.pop(row["job_hash"], None)
+                if sid is not None:
+                    matches.setdefault(sid, {})[row["job_hash"]] = rank
+                    rank += 1
+            # Only left when ranking was skipped for a broad term
+            for job_hash, sid in studio_of.items():
+                matches.setdefault(sid, {})[job_hash] = 0
+        except sqlite3.Error as e:
+            logger.error(f"Job search failed: {e}")
+        return matches
+
+    def data_version(self):
+        """
+        SQLite's `PRAGMA data_version` for this thread's connection. The value changes
+        whenever another connection (or process) commits to the database.
+        """
+        try:
+            return self.connect().execute("PRAGMA data_version").fetchone()[0]
+        except sqlite3.Error as e:
+            logger.error(f"Failed to read database version: {e}")
+            return None
+
+    def acquire_lease(self, name, owner, priority, ttl):
+        """
+        Takes or renews the lease `name` for `ttl` seconds. Succeeds if the lease is free,
+        expired, already held by `owner` or held with a lower priority.
+        """
+        now = time.time()
+        conn = self.connect()
+        try:
+            # Take the write lock before reading so two processes cannot both win
+            conn.execute("BEGIN IMMEDIATE")
+            row = conn.execute("SELECT owner, priority, expires FROM leases WHERE name = ?", (name,)).fetchone()
+            if row is not None and row["owner"] != owner and row["expires"] >= now and row["priority"] >= priority:
+                conn.rollback()
+                return False
+            conn.execute(
+                "INSERT OR REPLACE INTO leases (name, owner, priority, expires) VALUES (?, ?, ?, ?)",
+                (name, owner, priority, now + ttl),
+            )
+            conn.commit()
+            return True
+        except sqlite3.Error as e:
+            conn.rollback()
+            logger.error(f"Failed to acquire lease {name}: {e}")
+            return False
+
+    def release_lease(self, name, owner):
+        try:
+            with self.connect() as conn:
+                conn.execute("DELETE FROM leases WHERE name = ? AND owner = ?", (name, owner))
+                conn.commit()
+        except sqlite3.Error as e:
+            logger.error(f"Failed to release lease {name}: {e}")
+
+    def sync_studio_jobs(self, studio_id, jobs):
+        """
+        Updates the database with the current scrape results and cleanup stale ones.
+        Returns the full list of active jobs (seen in last 7 days) for the studio, newest first.
+        """
+        return self.sync_many([(studio_id, jobs)]).get(studio_id, [])
+
+    def sync_many(self, results):
+        """
+        Syncs the scrape results of several studios, given as [(studio_id, jobs)], in a
+        single transaction. Returns {studio_id: active jobs, newest first}; studios are
+        missing from it if the transaction failed.
+
+        Used by processes without a long-lived JobIndex (the daemon): the studios'
+        rows are read back into a temporary index and diffed the same way.
+        """
+        synced = {}
+        try:
+            with self.connect() as conn:
+                cursor = conn.cursor()
+                index = JobIndex(self.last_seen_granularity)
+                for studio_id, jobs in results:
+                    index.set_studio(studio_id, *self._studio_records(cursor, studio_id))
+                    synced[studio_id], changes = index.sync(studio_id, jobs)
+                    self._apply(cursor, changes)
+                conn.commit()
+        except sqlite3.Error as e:
+            logger.error(f"DB Sync failed for {', '.join(sid for sid, _ in results)}: {e}")
+            return {}
+        return synced
+
+    def apply_changes(self, changes_list):
+        """
+        Writes change sets produced by `JobIndex.sync` in a single transaction.
+        Returns False if the transaction failed and nothing was written.
+        """
+        try:
+            with self.connect() as conn:
+                cursor = conn.cursor()
+                for changes in changes_list:
+                    self._apply(cursor, changes)
+                conn.commit()
+            return True
+        except sqlite3.Error as e:
+            logger.error(f"DB Sync failed for {', '.join(c['studio_id'] for c in changes_list)}: {e}")
+            return False
+
+    def _apply(self, cursor, changes):
+        # 1. Upsert: Insert new jobs or update data for edited and relisted ones. first_seen is
+        # kept on conflict, unless the stored row had expired and was just not deleted yet
+        if changes["upserts"]:
+            cursor.executemany(
+                f"""
+                INSERT INTO jobs (job_hash, studio_id, title, link, location, extra_link, first_seen, last_seen)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT(job_hash) DO UPDATE SET
+                    title = excluded.title,
+                    link = excluded.link,
+                    location = excluded.location,
+                    extra_link = excluded.extra_link,
+                    first_seen = CASE
+                        WHEN last_seen < excluded.last_seen - {RETENTION_DAYS * 86400} THEN excluded.first_seen
+                        ELSE first_seen
+                    END,
+                    last_seen = excluded.last_seen,
+                    active = 1
+            """,
+                changes["upserts"],
+            )
+
+        # 2. Bump last_seen of unchanged jobs, one set-based UPDATE per chunk of hashes
+        bumps = changes["bumps"]
+        for i in range(0, len(bumps), SQL_VARIABLE_CHUNK):
+            chunk = bumps[i : i + SQL_VARIABLE_CHUNK]
+            cursor.execute(
+                f"UPDATE jobs SET last_seen = ? WHERE job_hash IN ({','.join('?' * len(chunk))})",
+                [changes["now"]] + chunk,
+            )
+
+        # 3. Flag jobs that are no longer listed; they are kept until the retention expires
+        disappeared = changes["disappeared"]
+        for i in range(0, len(disappeared), SQL_VARIABLE_CHUNK):
+            chunk = disappeared[i : i + SQL_VARIABLE_CHUNK]
+            cursor.execute(f"UPDATE jobs SET active = 0 WHERE job_hash IN ({','.join('?' * len(chunk))})", chunk)
+
+        # 4. Append the lifecycle events
+        if changes["events"]:
+            cursor.execute("INSERT OR IGNORE INTO studios (studio_id) VALUES (?)", (changes["studio_id"],))
+            studio_key = cursor.execute(
+                "SELECT studio_key FROM studios WHERE studio_id = ?", (changes["studio_id"],)
+            ).fetchone()[0]
+            ts = int(changes["now"])
+            cursor.executemany(
+                "INSERT INTO job_events (ts, studio_key, kind, job_hash) VALUES (?, ?, ?, ?)",
+                [(ts, studio_key, kind, h) for kind, h in changes["events"]],
+            )
+
+    def attach_archive(self):
+        """Attaches the archive to this thread's connection, creating it if needed. Returns the connection."""
+        conn = self.connect()
+        if not any(row["name"] == "archive" for row in conn.execute("PRAGMA database_list")):
+            conn.execute("ATTACH DATABASE ? AS archive", (self.archive_path,))
+            conn.execute("PRAGMA archive.journal_mode=WAL")
+            conn.execute("PRAGMA archive.auto_vacuum=INCREMENTAL")
+            for statement in ARCHIVE_SCHEMA:
+                conn.execute(statement)
+            conn.commit()
+        return conn
+
+    @staticmethod
+    def _archive_key(cursor, keys, table, column, value):
+        """Key of `value` in one of the archive's dictionary tables, added on first use."""
+        if value is None or value == "":
+            return None
+        key = keys.get(value)
+        if key is None:
+            cursor.execute(f"INSERT OR IGNORE INTO archive.{table} ({column}) VALUES (?)", (value,))
+            key = cursor.execute(f"SELECT rowid FROM archive.{table} WHERE {column} = ?", (value,)).fetchone()[0]
+            keys[value] = key
+        return key
+
+    def archive_expired(self, studio_id, limit=RETENTION_BATCH):
+        """
+        Moves up to `limit` of a studio's jobs past the retention to the archive in one
+        short transaction. Returns how many. Rows already archived by an interrupted
+        run are skipped, so a move is safe to repeat.
+        """
+        try:
+            cursor = self.connect().execute(
+                """
+                SELECT job_hash, title, link, location, extra_link, first_seen, last_seen
+                FROM jobs WHERE studio_id = ? AND last_seen < ? LIMIT ?
+            """,
+                (studio_id, self._expire_before(), limit),
+            )
+            rows = cursor.fetchall()
+            if not rows:
+                return 0
+
+            # Only attached (and created) once there is something to move
+            conn = self.attach_archive()
+            with conn:
+                cursor = conn.cursor()
+                keys = {"studios": {}, "locations": {}, "link_prefixes": {}}
+                studio_key = self._archive_key(cursor, keys["studios"], "studios", "studio_id", studio_id)
+                archived = []
+                for row in rows:
+                    link_prefix, link_tail = split_link(row["link"])
+                    extra_prefix, extra_tail = split_link(row["extra_link"])
+                    archived.append(
+                        (
+                            studio_key,
+                            int(row["first_seen"]),
+                            row["job_hash"],
+                            int(row["last_seen"]),
+                            row["title"],
+                            self._archive_key(cursor, keys["link_prefixes"], "link_prefixes", "prefix", link_prefix),
+                            link_tail,
+                            self._archive_key(cursor, keys["locations"], "locations", "location", row["location"]),
+                            self._archive_key(cursor, keys["link_prefixes"], "link_prefixes", "prefix", extra_prefix),
+                            extra_tail,
+                        )
+                    )
+                cursor.executemany("INSERT OR IGNORE INTO archive.jobs VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", archived)
+
+                hashes = [row["job_hash"] for row in rows]
+                for i in range(0, len(hashes), SQL_VARIABLE_CHUNK):
+                    chunk = hashes[i : i + SQL_VARIABLE_CHUNK]
+                    cursor.execute(f"DELETE FROM jobs WHERE job_hash IN ({','.join('?' * len(chunk))})", chunk)
+            return len(rows)
+        except sqlite3.Error as e:
+            logger.error(f"Failed to archive expired jobs: {e}")
+            return 0
+
+    def archived_jobs(self, studio_id, since=0):
+        """Returns a studio's archived jobs first seen since `since`, newest first. Reads the archive on demand."""
+        try:
+            cursor = self.attach_archive().execute(SELECT_ARCHIVED_JOBS, (studio_id, int(since)))
+            return [self._row_to_job(row) for row in cursor.fetchall()]
+        except sqlite3.Error as e:
+            logger.error(f"Failed to read the job archive: {e}")
+            return []
+
+    def maintain(self, should_yield=None):
+        """
+        Housekeeping for idle time: retention in batches of RETENTION_BATCH rows moved to
+        the archive, an incremental vacuum of the freed pages, `PRAGMA optimize` and a
+        WAL checkpoint.
+        Returns between steps as soon as `should_yield()` is true.
+        """
+        should_yield = should_yield or (lambda: False)
+
+        archived = 0
+        try:
+            studio_ids = [
+                row[0]
+                for row in self.connect().execute(
+                    "SELECT DISTINCT studio_id FROM jobs WHERE last_seen < ?", (self._expire_before(),)
+                )
+            ]
+        except sqlite3.Error as e:
+            logger.error(f"Database maintenance failed: {e}")
+            return
+        for studio_id in studio_ids:
+            while True:
+                count = self.archive_expired(studio_id)
+                archived += count
+                if count < RETENTION_BATCH or should_yield():
+                    break
+            if should_yield():
+                break
+        if archived:
+            logger.info(f"Archived {archived} expired jobs.")
+        if should_yield():
+            return
+
+        conn = self.connect()
+        try:
+            if conn.execute("PRAGMA auto_vacuum").fetchone()[0] != AUTO_VACUUM_INCREMENTAL:
+                # Files created before auto_vacuum was set need one full VACUUM to switch over
+                logger.info("Converting jobs.db to incremental auto-vacuum.")
+                conn.execute("PRAGMA auto_vacuum=INCREMENTAL")
+                conn.execute("VACUUM")
+            elif conn.execute("PRAGMA freelist_count").fetchone()[0]:
+                # Frees one page per step; execute() stops after the first, executescript() runs it through
+                conn.executescript(f"PRAGMA incremental_vacuum({VACUUM_PAGES});")
+            if should_yield():
+                return
+
+            conn.execute("PRAGMA optimize")
+            conn.execute("PRAGMA wal_checkpoint(TRUNCATE)").fetchall()
+        except sqlite3.Error as e:
+            logger.error(f"Database maintenance failed: {e}")
+
+    def clear_studio(self, studio_id):
+        try:
+            with self.connect() as conn:
+                conn.execute("DELETE FROM jobs WHERE studio_id = ?", (studio_id,))
+                conn.commit()
+        except sqlite3.Error:
+            pass
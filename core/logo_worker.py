@@ -1,6 +1,5 @@
 import os
-import urllib.request
-import ssl
+import threading
 from .logger import logger
 
 try:
@@ -40,6 +39,8 @@ class LogoWorker(QtCore.QThread):
         return image
 
     def process_logo(self, studio, ctx):
+        import urllib.request
+
         logo_url = studio.get("logo_url")
         studio_id = studio.get("id")
 
@@ -102,6 +103,7 @@ class LogoWorker(QtCore.QThread):
 
     def run(self):
         import concurrent.futures
+        import ssl
 
         ctx = ssl.create_default_context()
         ctx.check_hostname = False
@@ -183,3 +185,46 @@ class LogoWorker(QtCore.QThread):
 
     def stop(self):
         self._is_running = False
+
+
+class LogoLoader(QtCore.QThread):
+    """
+    Decodes and scales logo files off the UI thread, in the order they were asked for.
+    Results are QImages, which unlike QPixmaps may be created on any thread.
+    """
+
+    logo_loaded = QtCore.Signal(str, object, QtGui.QImage)  # studio_id, key passed to load, image
+
+    def __init__(self, width, height, parent=None):
+        super(LogoLoader, self).__init__(parent)
+        self.width = width
+        self.height = height
+        self._cond = threading.Condition()
+        self._requests = []  # [(studio_id, key, path)]
+        self._is_running = True
+
+    def load(self, studio_id, key, path):
+        with self._cond:
+            self._requests.append((studio_id, key, path))
+            self._cond.notify()
+
+    def stop(self):
+        with self._cond:
+            self._is_running = False
+            self._cond.notify()
+
+    def run(self):
+        while True:
+            with self._cond:
+                while self._is_running and not self._requests:
+                    self._cond.wait()
+                if not self._is_running:
+                    return
+                studio_id, key, path = self._requests.pop(0)
+
+            image = QtGui.QImage(path)
+            if not image.isNull():
+                image = image.scaled(
+                    self.width, self.height, QtCore.Qt.KeepAspectRatio, QtCore.Qt.SmoothTransformation
+                )
+            self.logo_loaded.emit(studio_id, key, image)
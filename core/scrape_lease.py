@@ -0,0 +1,41 @@
+import os
+import uuid
+
+from .logger import logger
+
+LEASE_NAME = "scrape"
+
+# The holder renews every LEASE_HEARTBEAT seconds; a lease not renewed for LEASE_TTL
+# seconds (crashed session) is up for grabs
+LEASE_HEARTBEAT = 10
+LEASE_TTL = 30
+
+# A daemon always takes over from a UI session
+PRIORITY_UI = 0
+PRIORITY_DAEMON = 1
+
+
+class ScrapeLease:
+    """
+    Scheduled-scrape leadership among every process sharing a jobs.db. The holder
+    scrapes on its schedule, everyone else only reads what the holder writes.
+    """
+
+    def __init__(self, store, priority=PRIORITY_UI):
+        self.store = store
+        self.priority = priority
+        self.owner = f"{os.getpid()}-{uuid.uuid4().hex[:8]}"
+        self.held = False
+
+    def renew(self):
+        """Takes or renews the lease. Returns True while this process is the leader."""
+        held = self.store.acquire_lease(LEASE_NAME, self.owner, self.priority, LEASE_TTL)
+        if held != self.held:
+            logger.info("Became scrape leader." if held else "Another process is the scrape leader, following.")
+        self.held = held
+        return held
+
+    def release(self):
+        if self.held:
+            self.store.release_lease(LEASE_NAME, self.owner)
+        self.held = False
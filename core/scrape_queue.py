@@ -0,0 +1,327 @@
+import concurrent.futures
+import concurrent.futures.process
+import multiprocessing.context
+import multiprocessing.spawn
+import os
+import threading
+import time
+from collections import OrderedDict
+
+from .logger import logger
+
+
+# Studios finished more recently than this are skipped by non-forced refreshes
+FRESH_SECONDS = 30
+
+# Upper bound for concurrent scrapes
+MAX_WORKERS = 20
+
+# Staleness and latency stop adding priority past these caps
+MAX_STALENESS_SECONDS = 48 * 3600
+MAX_LATENCY_SECONDS = 30.0
+
+# Parse processes are spawned interpreters (mayapy inside Maya), so keep few of them and
+# only while there is work: the pool is shut down after this long without any
+MAX_PARSE_PROCESSES = 4
+PARSE_POOL_IDLE_SECONDS = 30.0
+
+
+class ScrapeQueue:
+    """
+    Thread-safe queue of studios waiting to be scraped.
+
+    Requests are merged instead of replacing each other: a studio that is already
+    queued or in flight is never added twice, and studios that finished less than
+    FRESH_SECONDS ago are skipped unless the refresh is forced.
+
+    Pending studios are dispatched by priority rather than insertion order, see `priority`.
+    """
+
+    def __init__(self, fresh_seconds=FRESH_SECONDS, state_hint=None):
+        self.fresh_seconds = fresh_seconds
+        # Callable(studio_id) -> (enabled, visible), provided by the UI side
+        self.state_hint = state_hint
+        self._lock = threading.Condition()
+        self._pending = OrderedDict()  # {studio_id: studio}
+        self._in_flight = {}  # {studio_id: studio}
+        self._finished_at = {}  # {studio_id: monotonic timestamp}
+        self._last_success = {}  # {studio_id: epoch timestamp}
+        self._latency = {}  # {studio_id: smoothed seconds}
+
+    def seed_history(self, last_success=None, latency=None):
+        """Seeds scrape history persisted by a previous session."""
+        with self._lock:
+            self._last_success.update(last_success or {})
+            self._latency.update(latency or {})
+
+    def latency_snapshot(self):
+        with self._lock:
+            return dict(self._latency)
+
+    def priority(self, studio_id, now=None):
+        """
+        Higher is dispatched first. Enabled studios beat disabled ones, visible cards
+        beat off-screen ones, then long-unrefreshed studios and slow hosts go first so
+        they are not the last ones holding up the cycle.
+        """
+        now = now or time.time()
+        enabled, visible = True, False
+        if self.state_hint:
+            try:
+                enabled, visible = self.state_hint(studio_id)
+            except Exception:
+                pass
+
+        last = self._last_success.get(studio_id)
+        staleness = MAX_STALENESS_SECONDS if last is None else min(now - last, MAX_STALENESS_SECONDS)
+        latency = min(self._latency.get(studio_id, 0.0), MAX_LATENCY_SECONDS)
+
+        score = 0.0
+        if enabled:
+            score += 1000.0
+            if visible:
+                score += 500.0
+        score += 250.0 * staleness / MAX_STALENESS_SECONDS
+        score += 100.0 * latency / MAX_LATENCY_SECONDS
+        return score
+
+    def enqueue(self, studios, force=False):
+        """Adds studios to the queue. Returns the studios that were actually accepted."""
+        accepted = []
+        now = time.monotonic()
+        with self._lock:
+            for studio in studios:
+                sid = studio.get("id")
+                if not sid or sid in self._in_flight:
+                    continue
+                if sid in self._pending:
+                    # Keep the queue position but pick up the latest config
+                    self._pending[sid] = studio
+                    continue
+                if not force and now - self._finished_at.get(sid, -self.fresh_seconds) < self.fresh_seconds:
+                    continue
+
+                self._pending[sid] = studio
+                accepted.append(studio)
+
+            if accepted:
+                self._lock.notify_all()
+        return accepted
+
+    def take(self, limit):
+        """Moves the `limit` highest priority pending studios to the in-flight set and returns them."""
+        if limit <= 0:
+            return []
+        with self._lock:
+            if not self._pending:
+                return []
+            now = time.time()
+            # Stable sort keeps queue order between equal priorities
+            ranked = sorted(self._pending, key=lambda sid: -self.priority(sid, now))
+            taken = []
+            for sid in ranked[:limit]:
+                studio = self._pending.pop(sid)
+                self._in_flight[sid] = studio
+                taken.append(studio)
+        return taken
+
+    def done(self, studio_id, success=True, latency=None):
+        """Marks an in-flight studio as finished and records its scrape history."""
+        with self._lock:
+            self._in_flight.pop(studio_id, None)
+            self._finished_at[studio_id] = time.monotonic()
+            if success:
+                self._last_success[studio_id] = time.time()
+            if latency is not None:
+                prev = self._latency.get(studio_id)
+                self._latency[studio_id] = latency if prev is None else 0.7 * prev + 0.3 * latency
+            self._lock.notify_all()
+
+    def wait(self, timeout):
+        """Blocks until new work is queued or the timeout expires."""
+        with self._lock:
+            if not self._pending:
+                self._lock.wait(timeout)
+
+    def wake(self):
+        with self._lock:
+            self._lock.notify_all()
+
+    def is_idle(self):
+        """True when nothing is pending or in flight."""
+        with self._lock:
+            return not self._pending and not self._in_flight
+
+    def is_busy(self, studio_id):
+        with self._lock:
+            return studio_id in self._pending or studio_id in self._in_flight
+
+    def clear(self):
+        """Drops pending studios. In-flight ones are left to finish."""
+        with self._lock:
+            self._pending.clear()
+            self._lock.notify_all()
+
+
+def _timed(fetch, studio):
+    start = time.monotonic()
+    result = fetch(studio)
+    return result, time.monotonic() - start
+
+
+# Interpreter of the parse processes, see _ParseProcess
+_parse_executable = None
+_executable_lock = threading.Lock()
+
+
+class _ParseProcess(multiprocessing.context.SpawnProcess):
+    """
+    Spawns with `_parse_executable`. multiprocessing only has a process-wide spawn
+    executable, so when the host uses another one it is swapped for the duration of
+    the launch and restored afterwards. `_executable_lock` only serializes JobUI's own
+    launches: a process the host spawns from another thread during that window starts
+    with `_parse_executable` too. Outside Maya both are `sys.executable` and nothing
+    is swapped.
+    """
+
+    @staticmethod
+    def _Popen(process_obj):
+        with _executable_lock:
+            previous = multiprocessing.spawn.get_executable()
+            if _parse_executable is None or _parse_executable == previous:
+                return multiprocessing.context.SpawnProcess._Popen(process_obj)
+            multiprocessing.spawn.set_executable(_parse_executable)
+            try:
+                return multiprocessing.context.SpawnProcess._Popen(process_obj)
+            finally:
+                multiprocessing.spawn.set_executable(previous)
+
+
+class _ParseContext(multiprocessing.context.SpawnContext):
+    Process = _ParseProcess
+
+
+def create_parse_pool(processes=None):
+    """
+    Process pool for the parse stage. Always uses 'spawn' since forking a process that
+    runs Qt threads is unsafe. Returns None when processes cannot be started here.
+    """
+    global _parse_executable
+    from .scrape_service import get_python_executable
+
+    if processes is None:
+        # Leave a core for the host application's UI thread
+        processes = min(MAX_PARSE_PROCESSES, max(1, (os.cpu_count() or 2) - 1))
+    try:
+        _parse_executable = get_python_executable()
+        return concurrent.futures.ProcessPoolExecutor(max_workers=processes, mp_context=_ParseContext())
+    except Exception as e:
+        logger.error(f"Could not start parse processes, parsing in threads instead: {e}")
+        return None
+
+
+def dispatch(queue, fetch, on_ready, on_failed, is_running, max_workers=MAX_WORKERS, parse=None):
+    """
+    Drains `queue` until `is_running()` returns False, keeping up to `max_workers`
+    fetches in flight. `fetch(studio)` runs on a pool thread; `on_ready(studio_id, jobs,
+    latency)` and `on_failed(studio_id, error, latency)` are called from the calling thread.
+
+    When `parse` is given, `fetch` is only the network stage and its raw payloads are
+    handed to `parse(studio, payloads)` in a process pool, so parsing runs on every core
+    instead of contending for the GIL with the fetch threads. The process pool is started
+    with the first parse and shut down after PARSE_POOL_IDLE_SECONDS without work.
+    """
+    executor = concurrent.futures.ThreadPoolExecutor(max_workers=max_workers)
+    parse_pool = None
+    use_processes = parse is not None  # False once processes failed, then parsing runs in threads
+    idle_since = None
+    fetch_futures = {}  # {future: (studio, submitted)}
+    parse_futures = {}  # {future: (studio, payloads, latency)}
+
+    def submit_parse(studio, payloads, latency):
+        nonlocal parse_pool, use_processes
+        if use_processes and parse_pool is None:
+            parse_pool = create_parse_pool()
+            use_processes = parse_pool is not None
+        if parse_pool is not None:
+            try:
+                parse_futures[parse_pool.submit(parse, studio, payloads)] = (studio, payloads, latency)
+                return
+            except Exception as e:
+                logger.error(f"Parse processes unavailable, parsing in threads instead: {e}")
+                # Its pending parses fail with BrokenProcessPool and are retried in threads
+                parse_pool.shutdown(wait=False)
+                parse_pool = None
+                use_processes = False
+        parse_futures[executor.submit(parse, studio, payloads)] = (studio, payloads, latency)
+
+    def finish(studio, jobs=None, error=None, latency=None):
+        sid = studio.get("id")
+        if is_running():
+            if error is None:
+                on_ready(sid, jobs, latency)
+            else:
+                logger.error(f"Error processing jobs for {studio.get('name', 'Unknown')}: {error}")
+                on_failed(sid, str(error), latency)
+        # Only leave the in-flight set once the result has been handed over
+        queue.done(sid, success=error is None, latency=latency if error is None else None)
+
+    while is_running():
+        # Keep the fetch threads saturated with queued studios
+        for studio in queue.take(max_workers - len(fetch_futures)):
+            fetch_futures[executor.submit(_timed, fetch, studio)] = (studio, time.monotonic())
+
+        if not fetch_futures and not parse_futures:
+            if parse_pool is not None:
+                idle_since = idle_since or time.monotonic()
+                if time.monotonic() - idle_since >= PARSE_POOL_IDLE_SECONDS:
+                    parse_pool.shutdown(wait=False)
+                    parse_pool = None
+            queue.wait(0.2)
+            continue
+        idle_since = None
+
+        try:
+            done, _ = concurrent.futures.wait(
+                list(fetch_futures) + list(parse_futures),
+                timeout=0.2,
+                return_when=concurrent.futures.FIRST_COMPLETED,
+            )
+
+            for future in done:
+                if future in fetch_futures:
+                    studio, submitted = fetch_futures.pop(future)
+                    try:
+                        result, elapsed = future.result()
+                    except Exception as e:
+                        finish(studio, error=e, latency=time.monotonic() - submitted)
+                        continue
+
+                    if parse is None:
+                        finish(studio, jobs=result, latency=elapsed)
+                    else:
+                        submit_parse(studio, result, elapsed)
+                else:
+                    studio, payloads, elapsed = parse_futures.pop(future)
+                    try:
+                        finish(studio, jobs=future.result(), latency=elapsed)
+                    except concurrent.futures.process.BrokenProcessPool as e:
+                        # A parse process died: retry this studio in threads from now on
+                        logger.error(f"Parse processes unavailable, parsing in threads instead: {e}")
+                        if parse_pool is not None:
+                            parse_pool.shutdown(wait=False)
+                            parse_pool = None
+                        use_processes = False
+                        submit_parse(studio, payloads, elapsed)
+                    except Exception as e:
+                        finish(studio, error=e, latency=elapsed)
+        except Exception:
+            pass
+
+    # Cancelled by hand: shutdown(cancel_futures=True) needs Python 3.9, Maya 2022 ships 3.7
+    for f in list(fetch_futures) + list(parse_futures):
+        f.cancel()
+
+    executor.shutdown(wait=False)
+    if parse_pool is not None:
+        parse_pool.shutdown(wait=False)
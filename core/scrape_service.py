@@ -0,0 +1,141 @@
+"""
+Out-of-process scraping service.
+
+Runs `JobScraper` in a separate interpreter so that HTML parsing never competes with
+Maya's UI for the GIL. The parent (see `config_manager.JobProcess`) talks to it over
+stdin/stdout using one JSON object per line.
+
+Parent -> service:
+    {"cmd": "enqueue", "studios": [...], "force": false}
+    {"cmd": "state", "disabled": [...], "visible": [...]}
+    {"cmd": "seed", "last_success": {...}, "latency": {...}}
+    {"cmd": "stop"}
+
+Service -> parent:
+    {"event": "started", "ids": [...]}
+    {"event": "ready", "id": "...", "jobs": [[title, link, location, extra_link], ...], "latency": 1.2}
+    {"event": "failed", "id": "...", "error": "...", "latency": 1.2}
+"""
+
+import json
+import logging
+import os
+import sys
+import threading
+
+from .logger import logger
+
+
+def get_python_executable():
+    """
+    Returns an interpreter able to run the service. Inside Maya `sys.executable` is
+    the Maya binary itself, so the bundled `mayapy` next to it is used instead.
+    """
+    exe = sys.executable or "python"
+    name = os.path.basename(exe).lower()
+    if not name.startswith("maya") or name.startswith("mayapy"):
+        return exe
+
+    bin_dir = os.path.dirname(exe)
+    suffix = ".exe" if os.name == "nt" else ""
+    candidates = [
+        os.path.join(bin_dir, "mayapy" + suffix),
+        # macOS: Maya.app/Contents/MacOS/Maya -> Maya.app/Contents/bin/mayapy
+        os.path.join(os.path.dirname(bin_dir), "bin", "mayapy"),
+    ]
+    for path in candidates:
+        if os.path.exists(path):
+            return path
+    return exe
+
+
+class _Service:
+    def __init__(self, out_stream):
+        from .job_scraper import JobScraper
+        from .scrape_queue import ScrapeQueue
+
+        self._out = out_stream
+        self._write_lock = threading.Lock()
+        self._disabled = frozenset()
+        self._visible = frozenset()
+        self._running = True
+        self.scraper = JobScraper()
+        self.queue = ScrapeQueue(state_hint=self._state_hint)
+
+    def _state_hint(self, studio_id):
+        return studio_id not in self._disabled, studio_id in self._visible
+
+    def send(self, message):
+        line = json.dumps(message) + "\n"
+        with self._write_lock:
+            self._out.write(line.encode("utf-8"))
+            self._out.flush()
+
+    def handle(self, message):
+        cmd = message.get("cmd")
+        if cmd == "enqueue":
+            accepted = self.queue.enqueue(message.get("studios", []), force=message.get("force", False))
+            if accepted:
+                self.send({"event": "started", "ids": [s.get("id") for s in accepted]})
+        elif cmd == "state":
+            self._disabled = frozenset(message.get("disabled", []))
+            self._visible = frozenset(message.get("visible", []))
+        elif cmd == "seed":
+            self.queue.seed_history(message.get("last_success"), message.get("latency"))
+        elif cmd == "stop":
+            self.stop()
+
+    def read_commands(self, in_stream):
+        """Reader thread. EOF means the parent went away, so the service stops."""
+        for raw in iter(in_stream.readline, b""):
+            try:
+                self.handle(json.loads(raw.decode("utf-8")))
+            except Exception as e:
+                logger.error(f"Scrape service: bad command: {e}")
+        self.stop()
+
+    def stop(self):
+        self._running = False
+        self.queue.wake()
+
+    def is_running(self):
+        return self._running
+
+    def run(self):
+        from .job_scraper import parse_jobs
+        from .scrape_queue import dispatch
+
+        dispatch(
+            self.queue,
+            self.scraper.fetch_payloads,
+            self._on_ready,
+            self._on_failed,
+            self.is_running,
+            parse=parse_jobs,
+        )
+
+    def _on_ready(self, studio_id, jobs, latency):
+        self.send({"event": "ready", "id": studio_id, "jobs": jobs, "latency": latency})
+
+    def _on_failed(self, studio_id, error, latency):
+        self.send({"event": "failed", "id": studio_id, "error": error, "latency": latency})
+
+
+def main():
+    # stdout carries the protocol; anything else printed or logged goes to stderr
+    out_stream = sys.stdout.buffer
+    sys.stdout = sys.stderr
+
+    for handler in logger.handlers:
+        if isinstance(handler, logging.StreamHandler):
+            handler.setStream(sys.stderr)
+
+    service = _Service(out_stream)
+    reader = threading.Thread(target=service.read_commands, args=(sys.stdin.buffer,), daemon=True)
+    reader.start()
+    service.run()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
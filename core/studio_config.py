@@ -0,0 +1,286 @@
+"""
+Reading and writing the studio configuration.
+
+Studios live either in a single config/studios.json list or, when the directory
+config/studios/ exists, in one config/studios/<id>.json file per studio, so saving
+an edit writes one small file. `python -m JobUI.core.studio_config --split` creates
+that directory from studios.json.
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import re
+import sys
+import tempfile
+
+from .logger import logger
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Bump when the cache file changes shape
+CACHE_FORMAT = 2
+
+
+def resolve_config_path(root_dir):
+    """
+    Returns the studio config to use: the per-studio directory if it exists, else
+    studios.json, falling back to the shared mac resources.
+    """
+    studios_dir = os.path.join(root_dir, "config", "studios")
+    if os.path.isdir(studios_dir):
+        return studios_dir
+
+    config_path = os.path.join(root_dir, "config", "studios.json")
+    if os.path.exists(config_path):
+        return config_path
+
+    # Fallback to mac resources
+    project_root = os.path.dirname(root_dir)
+    mac_config = os.path.join(project_root, "mac", "Resources", "studios.json")
+    if os.path.exists(mac_config):
+        logger.info(f"Using shared config from {mac_config}")
+        return mac_config
+
+    logger.error(f"Config file not found at {config_path} or {mac_config}")
+    return config_path
+
+
+def studio_file(studios_dir, studio_id):
+    """Path of a studio's file in the per-studio layout."""
+    return os.path.join(studios_dir, re.sub(r"[^\w.-]", "_", str(studio_id)).lstrip(".") + ".json")
+
+
+def _studio_files(studios_dir):
+    return sorted(entry.path for entry in os.scandir(studios_dir) if entry.name.endswith(".json") and entry.is_file())
+
+
+def read_studios(config_path):
+    """
+    Reads studios.json (or the per-studio directory) and drops entries without an id
+    or flagged as disabled (later duplicates win). Returns (studios, raw_count), or
+    None if the config is missing or a file cannot be decoded.
+    """
+    if not os.path.exists(config_path):
+        return None
+
+    if os.path.isdir(config_path):
+        raw_studios = []
+        for path in _studio_files(config_path):
+            with open(path, "r", encoding="utf-8") as f:
+                try:
+                    raw_studios.append(json.load(f))
+                except json.JSONDecodeError:
+                    logger.error(f"Error decoding {path}")
+                    return None
+    else:
+        with open(config_path, "r", encoding="utf-8") as f:
+            try:
+                raw_studios = json.load(f)
+            except json.JSONDecodeError:
+                logger.error(f"Error decoding {config_path}")
+                return None
+
+    studios_map = {}
+    for s in raw_studios:
+        if "id" in s and not s.get("disabled", False):
+            studios_map[s["id"]] = s
+    return list(studios_map.values()), len(raw_studios)
+
+
+def cache_path(config_path):
+    """Startup cache of a config: config/studios.cache for both layouts."""
+    return os.path.splitext(config_path.rstrip(os.sep))[0] + ".cache"
+
+
+def read_studios_cached(config_path, version):
+    """
+    `read_studios` plus the config's signature and hash, as (studios, raw_count,
+    signature, hash). Served from a cache next to the config in a single read while
+    the config's stat signature and the JobUI version are unchanged, else read from the
+    config and cached. Returns None like `read_studios`.
+
+    The cache is plain JSON, not pickle: config/ is shared between sessions and
+    workstations, and loading it must not run whatever the file contains.
+    """
+    signature = config_signature(config_path)
+    if signature is None:
+        return None
+    path = cache_path(config_path)
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            # The key line is compared as text, a stale cache is not parsed any further
+            if f.readline().rstrip("\n") == _cache_key(config_path, version, signature):
+                studios, raw_count, cached_hash = json.load(f)
+                return studios, raw_count, signature, cached_hash
+    except FileNotFoundError:
+        pass
+    except Exception as e:
+        # Truncated, or not a cache written by this version
+        logger.debug(f"Ignoring config cache {path}: {e}")
+
+    result = read_studios(config_path)
+    if result is None:
+        return None
+    value = result + (signature, config_hash(config_path))
+    write_studios_cache(config_path, version, value)
+    return value
+
+
+def _cache_key(config_path, version, signature):
+    return json.dumps([CACHE_FORMAT, version, os.path.abspath(config_path), signature])
+
+
+def write_studios_cache(config_path, version, value):
+    """Caches a `read_studios_cached` result that was read from the config directly."""
+    studios, raw_count, signature, studios_hash = value
+    key = _cache_key(config_path, version, signature)
+    path = cache_path(config_path)
+    try:
+        _write_atomic(path, lambda f: f.write(key + "\n" + json.dumps([studios, raw_count, studios_hash])))
+    except OSError as e:
+        # A read-only shared config just goes uncached
+        logger.debug(f"Could not write config cache {path}: {e}")
+
+
+def _write_atomic(path, write):
+    fd, tmp_path = tempfile.mkstemp(prefix=".", suffix=".tmp", dir=os.path.dirname(path) or ".")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            write(f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
+def write_json_atomic(path, data):
+    """
+    Writes `data` to a temporary file next to `path` and renames it over `path`, so
+    readers (other sessions, the daemon) never see a half-written file.
+    """
+    _write_atomic(path, lambda f: json.dump(data, f, indent=4, ensure_ascii=False))
+
+
+def write_studios(config_path, studios, changed_ids=None, removed_ids=()):
+    """
+    Saves studios to studios.json or the per-studio directory. In the per-studio layout
+    only the files of `changed_ids` are written and those of `removed_ids` deleted;
+    `changed_ids=None` writes every studio and deletes files of studios not listed.
+    """
+    if not os.path.isdir(config_path):
+        write_json_atomic(config_path, studios)
+        return
+
+    by_id = {s.get("id"): s for s in studios}
+    if changed_ids is None:
+        changed_ids = list(by_id)
+        keep = {studio_file(config_path, sid) for sid in by_id}
+        removed_paths = [path for path in _studio_files(config_path) if path not in keep]
+    else:
+        removed_paths = [studio_file(config_path, sid) for sid in removed_ids if sid not in by_id]
+
+    for sid in changed_ids:
+        if sid in by_id:
+            write_json_atomic(studio_file(config_path, sid), by_id[sid])
+    for path in removed_paths:
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+
+def config_signature(config_path):
+    """
+    (mtime, size, inode) of studios.json, or of every file in the per-studio directory.
+    Changes whenever the config is written; None if it is missing.
+    """
+    try:
+        if os.path.isdir(config_path):
+            entries = sorted((e for e in os.scandir(config_path) if e.name.endswith(".json")), key=lambda e: e.name)
+            return tuple((e.name, e.stat().st_mtime_ns, e.stat().st_size, e.stat().st_ino) for e in entries)
+        st = os.stat(config_path)
+    except OSError:
+        return None
+    return st.st_mtime_ns, st.st_size, st.st_ino
+
+
+def config_hash(config_path):
+    """MD5 of studios.json, or of the names and contents of the per-studio files."""
+    if not config_path or not os.path.exists(config_path):
+        return None
+    paths = _studio_files(config_path) if os.path.isdir(config_path) else [config_path]
+    try:
+        hasher = hashlib.md5()
+        for path in paths:
+            hasher.update(os.path.basename(path).encode("utf-8"))
+            with open(path, "rb") as f:
+                for chunk in iter(lambda: f.read(4096), b""):
+                    hasher.update(chunk)
+        return hasher.hexdigest()
+    except OSError as e:
+        logger.error(f"Error calculating hash for {config_path}: {e}")
+        return None
+
+
+def studio_config_hash(studio):
+    """MD5 of a studio's settings, independent of key order."""
+    raw = json.dumps(studio, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.md5(raw.encode("utf-8")).hexdigest()
+
+
+def diff_studios(old_studios, new_studios):
+    """
+    Compares two studio lists by `id` and `studio_config_hash`. Returns {"added": [studios],
+    "removed": [studio_id], "updated": [studios]}; every list is empty if nothing changed.
+    """
+    old = {s.get("id"): studio_config_hash(s) for s in old_studios}
+    new = {s.get("id"): s for s in new_studios}
+    return {
+        "added": [s for sid, s in new.items() if sid not in old],
+        "removed": [sid for sid in old if sid not in new],
+        "updated": [s for sid, s in new.items() if sid in old and old[sid] != studio_config_hash(s)],
+    }
+
+
+def split_studios(config_path, studios_dir):
+    """Writes every studio of studios.json to its own file in `studios_dir`. Returns how many."""
+    result = read_studios(config_path)
+    if result is None:
+        return 0
+    os.makedirs(studios_dir, exist_ok=True)
+    write_studios(studios_dir, result[0])
+    return len(result[0])
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="JobUI studio configuration tools.")
+    parser.add_argument(
+        "--split",
+        action="store_true",
+        help="Copy studios.json to one file per studio in config/studios/, which is used from then on.",
+    )
+    args = parser.parse_args(argv)
+
+    if args.split:
+        config_path = os.path.join(ROOT_DIR, "config", "studios.json")
+        studios_dir = os.path.join(ROOT_DIR, "config", "studios")
+        count = split_studios(config_path, studios_dir)
+        if not count:
+            logger.error(f"No studios read from {config_path}.")
+            return 1
+        print(f"Wrote {count} studios to {studios_dir}.")
+        return 0
+
+    parser.print_help()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
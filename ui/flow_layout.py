@@ -20,6 +20,11 @@ class FlowLayout(QtWidgets.QLayout):
     def addItem(self, item):
         self._itemList.append(item)
 
+    def insertWidget(self, index, widget):
+        self.addChildWidget(widget)
+        self._itemList.insert(index, QtWidgets.QWidgetItem(widget))
+        self.invalidate()
+
     def horizontalSpacing(self):
         if self._hSpace >= 0:
             return self._hSpace
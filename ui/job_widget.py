@@ -121,6 +121,12 @@ class JobWidget(QtWidgets.QFrame):
                 lambda: QtGui.QDesktopServices.openUrl(QtCore.QUrl(extra_link))
             )
 
+        self._apply_style()
+
+        self.clicked.connect(self.open_link)
+
+    def _apply_style(self):
+        """Styles the frame according to the job's age."""
         # Dynamic Styling
         self.setStyleSheet(JOB_WIDGET_STYLE)
 
@@ -186,7 +192,15 @@ class JobWidget(QtWidgets.QFrame):
             """
             self.setStyleSheet(JOB_WIDGET_STYLE + highlight_style)
 
-        self.clicked.connect(self.open_link)
+    def refresh_age(self):
+        """Re-evaluates the age label and highlight; cheap when the label text did not change."""
+        old_text = self.time_text
+        self._process_data()
+        if self.time_text == old_text:
+            return
+        if self.time_label:
+            self.time_label.setText(self.time_text)
+        self._apply_style()
 
     def _init_layout(self):
         """Assembles layouts."""
@@ -1,4 +1,6 @@
 import re
+import bisect
+import time
 import maya.cmds as cmds
 
 try:
@@ -29,13 +31,15 @@ from .styles import GLOBAL_STYLE, SCROLL_AREA_STYLE
 
 from ..core.logger import logger
 from ..utils.maya_utils import get_maya_main_window
-from ..utils.updater import check_remote_version, format_relative_time
 from .. import resources
 
 from .. import VERSION, TOOL_TITLE
 
 from .studio_widget import StudioWidget
 
+# Studio cards created per event loop pass while the window fills in
+STUDIO_BATCH = 8
+
 
 class MainWindow(MayaQWidgetDockableMixin, QtWidgets.QMainWindow):
     TOOL_OBJECT_NAME = TOOL_TITLE.replace(" ", "")
@@ -43,6 +47,7 @@ class MainWindow(MayaQWidgetDockableMixin, QtWidgets.QMainWindow):
     WORKSPACE_CONTROL_NAME = "{}WorkspaceControl".format(TOOL_OBJECT_NAME)
 
     def __init__(self, parent=None):
+        self._opened_at = time.perf_counter()
         from ..utils.maya_utils import MAYA_AVAILABLE
 
         if MAYA_AVAILABLE:
@@ -55,15 +60,23 @@ class MainWindow(MayaQWidgetDockableMixin, QtWidgets.QMainWindow):
         self.setStyleSheet(GLOBAL_STYLE)
 
         # Native config
-        from ..core.config_manager import ConfigManager
+        from ..core.config_manager import shared_config_manager
 
         self.settings = QtCore.QSettings("JobUI", "MainWindow")
 
         # Load settings
-        self.config_manager = ConfigManager()
+        # Kept alive while the host runs, so reopening the window finds its jobs loaded
+        self.config_manager = shared_config_manager()
         self.studio_widgets = []
         self.menu_studio_actions = {}
 
+        # Cards still to be created, see refresh_studios_list
+        self._pending_studios = []
+        self._populate_timer = QtCore.QTimer(self)
+        self._populate_timer.setInterval(0)
+        self._populate_timer.timeout.connect(self._populate_studios)
+        self._last_search = ("", re.compile(""), None)  # (text, regex, matches) of _apply_search
+
         # Filter: On by default
         val = self.settings.value("only_show_with_jobs")
         if val is None:
@@ -71,9 +84,7 @@ class MainWindow(MayaQWidgetDockableMixin, QtWidgets.QMainWindow):
         else:
             self._only_show_with_jobs = val if isinstance(val, bool) else (str(val).lower() == "true")
 
-        # Auto-refresh timer
-        self.auto_refresh_timer = QtCore.QTimer(self)
-        self.auto_refresh_timer.timeout.connect(self.config_manager.fetch_all_jobs)
+        # Auto-refresh intervals, run by the config manager so they outlive the window
         self.refresh_intervals = [
             ("Never", None),
             ("10 sec", 10 * 1000),
@@ -103,8 +114,9 @@ class MainWindow(MayaQWidgetDockableMixin, QtWidgets.QMainWindow):
 
         self.config_manager.studio_visibility_changed.connect(self.on_studio_visibility_changed)
         self.config_manager.studios_visibility_changed.connect(self._do_search)
-        self.config_manager.studios_refreshed.connect(self.refresh_studios_list)
-        self.config_manager.jobs_updated.connect(self._on_jobs_updated_signal)
+        self.config_manager.studios_delta.connect(self._on_studios_delta)
+        self.config_manager.jobs_delta.connect(self._on_jobs_delta_signal)
+        self.config_manager.search_finished.connect(self._on_search_finished)
 
         # Debounce timer for search
         self.search_timer = QtCore.QTimer()
@@ -118,8 +130,15 @@ class MainWindow(MayaQWidgetDockableMixin, QtWidgets.QMainWindow):
         self.save_search_timer.setInterval(1000)
         self.save_search_timer.timeout.connect(self._save_search_text)
 
-        # Fetch all on startup
-        QtCore.QTimer.singleShot(500, self.config_manager.fetch_all_jobs)
+        # Debounce timer for reporting on-screen studios (scrape priority)
+        self.visible_studios_timer = QtCore.QTimer()
+        self.visible_studios_timer.setSingleShot(True)
+        self.visible_studios_timer.setInterval(100)
+        self.visible_studios_timer.timeout.connect(self._report_visible_studios)
+        self.scroll_area.verticalScrollBar().valueChanged.connect(self.visible_studios_timer.start)
+
+        # Refresh what is not fresh on startup (followers just show what the leader session stored)
+        QtCore.QTimer.singleShot(500, self.config_manager.fetch_stale_jobs)
 
     def setup_ui(self):
         central = QtWidgets.QWidget()
@@ -217,6 +236,13 @@ class MainWindow(MayaQWidgetDockableMixin, QtWidgets.QMainWindow):
         act.triggered.connect(self.confirm_refresh_logos)
         opts.addAction(act)
 
+        act_process = QAction("Scrape in Separate Process", self)
+        act_process.setCheckable(True)
+        act_process.setChecked(self.config_manager.use_scrape_process)
+        act_process.setToolTip("Keeps Maya responsive while studios are refreshed")
+        act_process.toggled.connect(self.config_manager.set_scrape_process_enabled)
+        opts.addAction(act_process)
+
         # Help Menu
         help_menu = menubar.addMenu("Help")
 
@@ -309,9 +335,8 @@ class MainWindow(MayaQWidgetDockableMixin, QtWidgets.QMainWindow):
 
     def on_refresh_interval_changed(self, index):
         label, ms = self.refresh_intervals[index]
-        self.auto_refresh_timer.stop()
+        self.config_manager.set_auto_refresh_interval(ms)
         if ms is not None:
-            self.auto_refresh_timer.start(ms)
             logger.info(f"Auto-refresh set to {label}")
         else:
             logger.info("Auto-refresh disabled")
@@ -363,7 +388,7 @@ class MainWindow(MayaQWidgetDockableMixin, QtWidgets.QMainWindow):
             # Check if we have ANY jobs cached at all in enabled studios.
             # This helps distinguish between 'Just started' and 'Found nothing'.
             total_jobs_cached = sum(
-                len(self.config_manager.get_studio_jobs(s.get("id")) or [])
+                self.config_manager.get_studio_job_count(s.get("id"))
                 for s in studios
                 if self.config_manager.is_studio_enabled(s.get("id"))
             )
@@ -413,23 +438,112 @@ class MainWindow(MayaQWidgetDockableMixin, QtWidgets.QMainWindow):
                 widget.deleteLater()
 
         self.studio_widgets = []
-        studios = self.config_manager.get_studios()
-        # Sort by name to match the menu and provide consistent UI
-        sorted_studios = sorted(studios, key=lambda s: s.get("name", "").lower())
 
-        for studio in sorted_studios:
-            is_enabled = self.config_manager.is_studio_enabled(studio.get("id"))
-            sw = StudioWidget(studio, self.config_manager)
-            sw.setFixedSize(260, 220)
-            self.studios_layout.addWidget(sw)
-            self.studio_widgets.append(sw)
-            if not is_enabled:
-                sw.hide()
+        # Cards are created STUDIO_BATCH at a time once the window is up, enabled studios
+        # with jobs first; each lands at its place in the name order
+        def build_order(studio):
+            sid = studio.get("id")
+            has_jobs = self.config_manager.get_studio_job_count(sid) > 0
+            return not self.config_manager.is_studio_enabled(sid), not has_jobs, self._studio_sort_key(studio)
+
+        studios = sorted(self.config_manager.get_studios(), key=build_order, reverse=True)
+        self._pending_studios = [s.get("id") for s in studios]
+        self._populate_timer.start()
+
+    def _populate_studios(self):
+        """Creates the next batch of pending studio cards."""
+        if not isValid(self):
+            return
+        first_batch = not self.studio_widgets
+
+        studios = {s.get("id"): s for s in self.config_manager.get_studios()}
+        built = {sw.studio_data.get("id") for sw in self.studio_widgets}
+        new_widgets = []
+        for _ in range(STUDIO_BATCH):
+            if not self._pending_studios:
+                break
+            sid = self._pending_studios.pop()
+            # Studios removed meanwhile are gone, added ones already have a card
+            if sid in studios and sid not in built:
+                sw = self._create_studio_widget(studios[sid])
+                self._insert_studio_widget(sw)
+                new_widgets.append(sw)
+
+        if self._pending_studios:
+            # Only the new cards take the current filter, the search itself runs once at the end
+            for sw in new_widgets:
+                self._filter_studio_widget(sw, *self._last_search)
+            visible_count = sum(not sw.isHidden() for sw in self.studio_widgets)
+            enabled_count = sum(
+                self.config_manager.is_studio_enabled(sw.studio_data.get("id")) for sw in self.studio_widgets
+            )
+            self._update_placeholders(visible_count, enabled_count, self._last_search[0])
+            self.visible_studios_timer.start()
+        else:
+            self._do_search()
+
+        # Startup timings are info messages, printed when LOGGING is enabled in core/logger.py
+        opened_at = self._opened_at
+        if first_batch:
+            # Logged on the next pass, once the first cards were painted
+            QtCore.QTimer.singleShot(
+                0, lambda: logger.info(f"First studios shown {(time.perf_counter() - opened_at) * 1000:.0f} ms in.")
+            )
+        if not self._pending_studios:
+            self._populate_timer.stop()
+            elapsed = (time.perf_counter() - opened_at) * 1000
+            logger.info(f"Loaded {len(self.studio_widgets)} studios {elapsed:.0f} ms after opening.")
+
+    @staticmethod
+    def _studio_sort_key(studio):
+        return studio.get("name", "").lower()
+
+    def _create_studio_widget(self, studio):
+        sw = StudioWidget(studio, self.config_manager)
+        sw.setFixedSize(260, 220)
+        if not self.config_manager.is_studio_enabled(studio.get("id")):
+            sw.hide()
+        return sw
+
+    def _insert_studio_widget(self, sw):
+        """Adds a card at its place in the name order of `studio_widgets`."""
+        keys = [self._studio_sort_key(w.studio_data) for w in self.studio_widgets]
+        index = bisect.bisect_right(keys, self._studio_sort_key(sw.studio_data))
+        self.studios_layout.insertWidget(index, sw)
+        self.studio_widgets.insert(index, sw)
+
+    def _take_studio_widget(self, sw):
+        self.studios_layout.removeWidget(sw)
+        self.studio_widgets.remove(sw)
+
+    def _on_studios_delta(self, delta):
+        """Adds, removes and updates only the cards of the studios that changed in studios.json."""
+        widgets = {sw.studio_data.get("id"): sw for sw in self.studio_widgets}
+
+        for sid in delta["removed"]:
+            sw = widgets.get(sid)
+            if sw:
+                self._take_studio_widget(sw)
+                sw.deleteLater()
+
+        for studio in delta["updated"]:
+            sw = widgets.get(studio.get("id"))
+            if sw:
+                # A renamed studio moves to its new place, its jobs stay
+                self._take_studio_widget(sw)
+                sw.set_studio_data(studio)
+                self._insert_studio_widget(sw)
+
+        for studio in delta["added"]:
+            self._insert_studio_widget(self._create_studio_widget(studio))
 
         self._do_search()
         self._update_placeholders()
 
-        logger.info(f"Loaded {len(studios)} studios.")
+        logger.info(
+            f"Studios changed: {len(delta['added'])} added, {len(delta['removed'])} removed, "
+            f"{len(delta['updated'])} updated."
+        )
 
     def on_search_changed(self, text):
         if not isValid(self):
@@ -445,9 +559,9 @@ class MainWindow(MayaQWidgetDockableMixin, QtWidgets.QMainWindow):
         self.settings.setValue("last_search", self.search_input.text())
         logger.info("Search text saved to settings.")
 
-    def _on_jobs_updated_signal(self, sid, jobs):
-        """Signal handler for jobs being ready."""
-        if isValid(self):
+    def _on_jobs_delta_signal(self, sid, delta):
+        """Signal handler for jobs being ready. A refresh that changed nothing needs no new search."""
+        if isValid(self) and any(delta.values()):
             self._do_search()
 
     def _do_search(self):
@@ -455,31 +569,46 @@ class MainWindow(MayaQWidgetDockableMixin, QtWidgets.QMainWindow):
             return
 
         text = self.search_input.text()
+
+        # Plain text is looked up in the database's full-text index, see _on_search_finished
+        if not self.config_manager.search_jobs(text):
+            self._apply_search(text)
+
+    def _on_search_finished(self, text, matches):
+        # Drop answers to text that has been edited since
+        if isValid(self) and isValid(self.search_input) and text == self.search_input.text():
+            self._apply_search(text, matches)
+
+    def _apply_search(self, text, matches=None):
+        """
+        Filters the studio cards by a regex, or by full-text `matches`
+        ({studio_id: {job_hash: rank}}) when given.
+        """
         visible_count = 0
         enabled_count = 0
 
-        # Pre-compile regex once for all studios
-        try:
-            regex = re.compile(text, re.IGNORECASE)
-        except re.error:
-            regex = re.compile(re.escape(text), re.IGNORECASE)
-
-        for sw in self.studio_widgets:
-            match_count = sw.filter_jobs(regex)
+        if matches is None:
+            if text:
+                # Only the newest jobs of each studio are loaded at startup, search them all.
+                # Studios read from the database emit jobs_delta and get searched again.
+                studio_ids = [s.get("id") for s in self.config_manager.get_studios()]
+                self.config_manager.ensure_jobs_loaded(
+                    [sid for sid in studio_ids if self.config_manager.is_studio_enabled(sid)]
+                )
 
-            # Check primary enabled state
-            sid = sw.studio_data.get("id")
-            is_enabled = self.config_manager.is_studio_enabled(sid)
+            # Pre-compile regex once for all studios
+            try:
+                regex = re.compile(text, re.IGNORECASE)
+            except re.error:
+                regex = re.compile(re.escape(text), re.IGNORECASE)
+        else:
+            regex = None
+        self._last_search = (text, regex, matches)
 
-            if is_enabled:
-                enabled_count += 1
-                if self._only_show_with_jobs and match_count == 0:
-                    sw.hide()
-                else:
-                    sw.show()
-                    visible_count += 1
-            else:
-                sw.hide()
+        for sw in self.studio_widgets:
+            is_enabled, is_visible = self._filter_studio_widget(sw, text, regex, matches)
+            enabled_count += is_enabled
+            visible_count += is_visible
 
         self._update_placeholders(visible_count, enabled_count, text)
         self.update_studios_menu_checks()
@@ -487,6 +616,40 @@ class MainWindow(MayaQWidgetDockableMixin, QtWidgets.QMainWindow):
         self.studios_layout.invalidate()
         self.studios_layout.activate()
 
+        if hasattr(self, "visible_studios_timer"):
+            self.visible_studios_timer.start()
+
+    def _filter_studio_widget(self, sw, text, regex, matches):
+        """Filters a card's jobs and shows or hides the card. Returns (enabled, visible)."""
+        if matches is None:
+            match_count = sw.filter_jobs(regex)
+        elif text.lower() in sw.studio_data.get("name", "").lower():
+            # Studio names are not in the index, a matching name shows all of its jobs
+            match_count = sw.filter_jobs("")
+        else:
+            match_count = sw.filter_jobs(text, ranks=matches.get(sw.studio_data.get("id"), {}))
+
+        # Check primary enabled state
+        if not self.config_manager.is_studio_enabled(sw.studio_data.get("id")):
+            sw.hide()
+            return False, False
+        if self._only_show_with_jobs and match_count == 0:
+            sw.hide()
+            return True, False
+        sw.show()
+        return True, True
+
+    def _report_visible_studios(self):
+        """Tells the config manager which studio cards are on screen so they refresh first."""
+        if not isValid(self):
+            return
+        visible = [
+            sw.studio_data.get("id")
+            for sw in self.studio_widgets
+            if isValid(sw) and sw.isVisible() and not sw.visibleRegion().isEmpty()
+        ]
+        self.config_manager.set_visible_studios(visible)
+
     def show_coffee(self):
         credits_dialog = QtWidgets.QMessageBox(self)
         # credits_dialog.setWindowFlags(self.windowFlags() & Qt.FramelessWindowHint)
@@ -511,6 +674,8 @@ class MainWindow(MayaQWidgetDockableMixin, QtWidgets.QMainWindow):
         exec_fn()
 
     def check_for_updates(self):
+        from ..utils.updater import check_remote_version, format_relative_time
+
         remote_ver, remote_date = check_remote_version()
         rel_time = format_relative_time(remote_date)
         date_info = " ({})".format(rel_time) if rel_time else ""
@@ -651,17 +816,23 @@ class MainWindow(MayaQWidgetDockableMixin, QtWidgets.QMainWindow):
             self.search_timer.stop()
         if hasattr(self, "save_search_timer") and self.save_search_timer.isActive():
             self.save_search_timer.stop()
+        if hasattr(self, "visible_studios_timer") and self.visible_studios_timer.isActive():
+            self.visible_studios_timer.stop()
+        self._populate_timer.stop()
 
         if self.config_manager:
-            # Disconnect signals to prevent callbacks to a deleted UI
+            # Disconnect signals to prevent callbacks to a deleted UI. The manager itself
+            # stays alive for the next window, see `shared_config_manager`; the cards'
+            # connections go when they are deleted with this window.
             try:
                 self.config_manager.studio_visibility_changed.disconnect(self.on_studio_visibility_changed)
-                self.config_manager.studios_refreshed.disconnect(self.refresh_studios_list)
-                self.config_manager.jobs_updated.disconnect(self._on_jobs_updated_signal)
+                self.config_manager.studios_visibility_changed.disconnect(self._do_search)
+                self.config_manager.studios_delta.disconnect(self._on_studios_delta)
+                self.config_manager.jobs_delta.disconnect(self._on_jobs_delta_signal)
+                self.config_manager.search_finished.disconnect(self._on_search_finished)
             except (RuntimeError, TypeError):
                 pass
-
-            self.config_manager.cleanup()
+            self.config_manager.set_visible_studios(())
 
         try:
             if cmds.workspaceControl(self.WORKSPACE_CONTROL_NAME, exists=True):
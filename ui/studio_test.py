@@ -182,6 +182,7 @@ class TestPreviewDialog(QtWidgets.QDialog):
                 logo_cleared = Signal()
                 logo_downloaded = Signal()
                 jobs_updated = Signal()
+                jobs_delta = Signal()
                 jobs_failed = Signal()
                 jobs_started = Signal()
 
@@ -191,6 +192,12 @@ class TestPreviewDialog(QtWidgets.QDialog):
                 def get_studio_jobs(self, sid):
                     return self.m_jobs
 
+                def get_studio_job_count(self, sid):
+                    return len(self.m_jobs)
+
+                def ensure_jobs_loaded(self, studio_ids):
+                    pass
+
                 def is_studio_enabled(self, sid):
                     return True
 
@@ -1,4 +1,3 @@
-import os
 import re
 
 try:
@@ -18,6 +17,8 @@ class StudioWidget(QtWidgets.QFrame):
         self.studio_data = studio_data
         self.config_manager = config_manager
         self.job_widgets = []
+        self._widgets_by_hash = {}  # {job_hash: JobWidget}
+        self._filter = None  # Last filter_jobs arguments, re-applied to patched widgets
         self.no_match_label = None
         self.is_errored = False
 
@@ -96,16 +97,26 @@ class StudioWidget(QtWidgets.QFrame):
         self.scroll_area.setWidget(self.scroll_content)
         layout.addWidget(self.scroll_area)
 
+        # Older jobs are only loaded once the list is scrolled to its end
+        self.scroll_area.verticalScrollBar().valueChanged.connect(self.on_scrolled)
+
         self.load_logo()
         self.update_jobs()
 
         # Connect signals
         self.config_manager.logo_cleared.connect(self.on_logo_cleared)
         self.config_manager.logo_downloaded.connect(self.on_logo_downloaded)
-        self.config_manager.jobs_updated.connect(self.on_jobs_updated)
+        self.config_manager.logo_loaded.connect(self.on_logo_loaded)
+        self.config_manager.jobs_delta.connect(self.on_jobs_delta)
         self.config_manager.jobs_failed.connect(self.on_jobs_failed)
         self.config_manager.jobs_started.connect(self.on_jobs_started)
 
+    def set_studio_data(self, studio_data):
+        """Applies edited settings in place, keeping the card's jobs and scroll position."""
+        self.studio_data = studio_data
+        self.logo_label.setToolTip("Open %s Careers Page" % studio_data.get("name"))
+        self.load_logo()
+
     def open_careers_page(self):
         url = self.studio_data.get("website") or self.studio_data.get("careers_url")
         if url:
@@ -141,16 +152,11 @@ class StudioWidget(QtWidgets.QFrame):
             QtCore.QTimer.singleShot(10, lambda: self.config_manager.update_studio(dialog.studio_data))
 
     def load_logo(self):
-        sid = self.studio_data.get("id")
-        path = self.config_manager.get_logo_path(sid)
-
-        if path and os.path.exists(path):
-            pix = QtGui.QPixmap(path)
-            if not pix.isNull():
-                self.logo_label.setPixmap(
-                    pix.scaled(110, 30, QtCore.Qt.KeepAspectRatio, QtCore.Qt.SmoothTransformation)
-                )
-                return
+        # Empty until the logo is decoded in the background, then `logo_loaded` calls this again
+        pix = self.config_manager.logo_pixmap(self.studio_data.get("id"))
+        if pix is not None:
+            self.logo_label.setPixmap(pix)
+            return
 
         # Fallback to name text
         self.logo_label.setText(self.studio_data.get("name") or self.studio_data.get("id"))
@@ -167,28 +173,44 @@ class StudioWidget(QtWidgets.QFrame):
         if sid == self.studio_data.get("id"):
             self.load_logo()
 
+    def on_logo_loaded(self, sid):
+        if sid == self.studio_data.get("id"):
+            self.load_logo()
+
     def on_jobs_started(self, sid):
         if sid == self.studio_data.get("id"):
             self.refresh_btn.hide()
             self.spinner.show()
             self.scroll_area.setEnabled(False)
 
+    def on_jobs_delta(self, sid, delta):
+        if sid == self.studio_data.get("id"):
+            jobs = self.config_manager.get_studio_jobs(sid)
+            if self.is_errored or not self.job_widgets or not jobs:
+                # The error banner or the "No jobs found" placeholder changes, rebuild
+                self.is_errored = False
+                self.update_jobs()
+            else:
+                self.apply_delta(delta, jobs)
+            self.on_jobs_updated(sid, jobs)
+
     def on_jobs_updated(self, sid, jobs):
         if sid == self.studio_data.get("id"):
-            self.is_errored = False
-            self.update_jobs()
             self.spinner.hide()
 
             # Use different icon if no jobs found
             icon_name = "success.svg" if jobs else "empty.svg"
             self.refresh_btn.setIcon(resources.get_icon(icon_name))
 
-            self.refresh_btn.setToolTip(
-                f"Found {len(jobs)} job{'' if len(jobs) == 1 else 's'} for {self.studio_data['name']}"
-            )
+            count = self.config_manager.get_studio_job_count(sid)
+            self.refresh_btn.setToolTip(f"Found {count} job{'' if count == 1 else 's'} for {self.studio_data['name']}")
             self.refresh_btn.show()
             self.scroll_area.setEnabled(True)
 
+    def on_scrolled(self, value):
+        if value and value == self.scroll_area.verticalScrollBar().maximum():
+            self.config_manager.ensure_jobs_loaded([self.studio_data.get("id")])
+
     def on_jobs_failed(self, sid, error_message):
         if sid == self.studio_data.get("id"):
             self.spinner.hide()
@@ -214,6 +236,48 @@ class StudioWidget(QtWidgets.QFrame):
             self.refresh_btn.show()
             self.scroll_area.setEnabled(True)
 
+    def apply_delta(self, delta, jobs):
+        """
+        Patches the job list in place: removed jobs lose their widget, added and changed
+        ones get a new one, everything else is kept. An empty delta only refreshes ages.
+        """
+        for job_hash in delta["removed"]:
+            self._discard_job_widget(job_hash)
+        for job in delta["changed"]:
+            self._discard_job_widget(job.get("job_hash"))
+
+        for index, job in enumerate(jobs):
+            w = self._widgets_by_hash.get(job.get("job_hash"))
+            if w is None:
+                w = JobWidget(job)
+                self._widgets_by_hash[job.get("job_hash")] = w
+            else:
+                w.refresh_age()
+
+            # Jobs come newest first, move the widget only if it is out of place
+            if self.scroll_layout.indexOf(w) != index:
+                self.scroll_layout.removeWidget(w)
+                self.scroll_layout.insertWidget(index, w)
+
+        self.job_widgets = [self._widgets_by_hash[job.get("job_hash")] for job in jobs]
+        # Re-filter new widgets; a ranked search also has to restore its order
+        if self._filter is not None and (delta["added"] or delta["changed"] or self._filter[1]):
+            self.filter_jobs(*self._filter)
+
+    def _arrange(self, widgets):
+        """Puts the job widgets in the given order, moving only the ones out of place."""
+        first = 1 if self.is_errored else 0  # Below the "Website Error" banner
+        for index, w in enumerate(widgets, first):
+            if self.scroll_layout.indexOf(w) != index:
+                self.scroll_layout.removeWidget(w)
+                self.scroll_layout.insertWidget(index, w)
+
+    def _discard_job_widget(self, job_hash):
+        w = self._widgets_by_hash.pop(job_hash, None)
+        if w is not None:
+            self.scroll_layout.removeWidget(w)
+            w.deleteLater()
+
     def update_jobs(self):
         # Clear existing
         while self.scroll_layout.count():
@@ -223,6 +287,7 @@ class StudioWidget(QtWidgets.QFrame):
 
         jobs = self.config_manager.get_studio_jobs(self.studio_data.get("id"))
         self.job_widgets = []
+        self._widgets_by_hash = {}
 
         if self.is_errored:
             err_lbl = QtWidgets.QLabel("⚠️ Website Error")
@@ -240,6 +305,7 @@ class StudioWidget(QtWidgets.QFrame):
                 w = JobWidget(job)
                 self.scroll_layout.addWidget(w)
                 self.job_widgets.append(w)
+                self._widgets_by_hash[job.get("job_hash")] = w
 
             # Label for search filtering
             self.no_match_label = QtWidgets.QLabel("No matches found")
@@ -249,28 +315,44 @@ class StudioWidget(QtWidgets.QFrame):
             self.scroll_layout.addWidget(self.no_match_label)
         self.scroll_layout.addStretch()  # Ensure top alignment
 
-    def filter_jobs(self, pattern_or_regex):
+        if self._filter is not None:
+            self.filter_jobs(*self._filter)
+
+    def filter_jobs(self, pattern_or_regex, ranks=None):
         """
-        Filters job widgets based on a string pattern or pre-compiled regex.
+        Filters job widgets based on a string pattern or pre-compiled regex, or on
+        full-text search `ranks` ({job_hash: rank}) when given, best matches first.
         Returns the number of matching jobs.
         """
         match_count = 0
-        if isinstance(pattern_or_regex, str):
+        if ranks is not None:
+            regex = None
+        elif isinstance(pattern_or_regex, str):
             try:
                 regex = re.compile(pattern_or_regex, re.IGNORECASE)
             except re.error:
                 regex = re.compile(re.escape(pattern_or_regex), re.IGNORECASE)
         else:
             regex = pattern_or_regex
+        self._filter = (regex or pattern_or_regex, ranks)
 
         for w in self.job_widgets:
-            title = w.job_data.get("title", "")
-            if regex.search(title):
+            if ranks is not None:
+                matched = w.job_data.get("job_hash") in ranks
+            else:
+                matched = regex.search(w.job_data.get("title", ""))
+            if matched:
                 w.show()
                 match_count += 1
             else:
                 w.hide()
 
+        if ranks:
+            # sorted() is stable: jobs the index did not return keep their newest-first order
+            self._arrange(sorted(self.job_widgets, key=lambda w: ranks.get(w.job_data.get("job_hash"), len(ranks))))
+        else:
+            self._arrange(self.job_widgets)
+
         if self.no_match_label:
             if match_count == 0 and len(self.job_widgets) > 0:
                 # Use pattern string for label if available